@@ -54,6 +54,7 @@ a = Analysis(
         'services.twitch_live_checker',
         'services.web_dashboard_client',
         'utils',
+        'utils.json_utils',
         'utils.playlist_selector',
         'utils.video_downloader',
         'utils.video_processor',
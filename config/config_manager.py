@@ -27,6 +27,9 @@ class ConfigManager:
         self._cached_playlists: Optional[List[Dict]] = None
         self._settings_cache_mtime: float = 0
         self._playlists_cache_mtime: float = 0
+        # name -> playlist index over the cached playlists list
+        self._playlists_by_name: Dict[str, Dict] = {}
+        self._playlists_index_source: Optional[List[Dict]] = None
 
         # Create default files if they don't exist
         if not os.path.exists(self.config_path):
@@ -144,6 +147,21 @@ class ConfigManager:
         self._cached_playlists = config.get('playlists', []) if config else []
         return self._cached_playlists
 
+    def get_playlist_by_name(self, name: str) -> Optional[Dict]:
+        """Get a playlist configuration by name (first match), or None.
+
+        Backed by a dict index that is rebuilt whenever get_playlists()
+        re-reads the file, so lookups are O(1) instead of a list scan.
+        """
+        playlists = self.get_playlists()
+        if self._playlists_index_source is not playlists:
+            index: Dict[str, Dict] = {}
+            for p in playlists:
+                index.setdefault(p.get('name'), p)
+            self._playlists_by_name = index
+            self._playlists_index_source = playlists
+        return self._playlists_by_name.get(name)
+
     def get_settings(self) -> Dict:
         """Get application settings from settings.json (cached, re-read on file change).
         
@@ -9,7 +9,6 @@ import logging
 import os
 import signal
 import asyncio
-import json
 from threading import Event
 from typing import Optional, List
 from dotenv import load_dotenv
@@ -33,6 +32,7 @@ from handlers.content_switch_handler import ContentSwitchHandler
 from handlers.dashboard_handler import DashboardHandler
 from handlers.temp_playback_handler import TempPlaybackHandler
 from utils.video_processor import kill_all_running_processes as kill_processor_processes
+from utils import json_utils
 from services.web_dashboard_client import WebDashboardClient
 from monitors.obs_freeze_monitor import OBSFreezeMonitor
 from config.constants import (
@@ -154,6 +154,8 @@ class AutomationController:
         self._env_kick_client_id = KICK_CLIENT_ID
         self._env_kick_client_secret = KICK_CLIENT_SECRET
         self._env_discord_webhook_url = DISCORD_WEBHOOK_URL
+        self._env_twitch_enabled = os.getenv("ENABLE_TWITCH", "").lower() == "true"
+        self._env_kick_enabled = os.getenv("ENABLE_KICK", "").lower() == "true"
 
         # State
         self.current_session_id: Optional[int] = None
@@ -203,7 +205,7 @@ class AutomationController:
         if WEB_DASHBOARD_URL and WEB_DASHBOARD_API_KEY:
             self.web_dashboard = WebDashboardClient(
                 api_key=WEB_DASHBOARD_API_KEY,
-                state_provider=self.dashboard_handler.get_dashboard_state,
+                state_provider=self.dashboard_handler.get_dashboard_state_async,
                 command_handler=self.dashboard_handler.handle_command,
                 server_url=WEB_DASHBOARD_URL,
             )
@@ -469,6 +471,8 @@ class AutomationController:
         self._env_kick_client_id = KICK_CLIENT_ID
         self._env_kick_client_secret = KICK_CLIENT_SECRET
         self._env_discord_webhook_url = DISCORD_WEBHOOK_URL
+        self._env_twitch_enabled = os.getenv("ENABLE_TWITCH", "").lower() == "true"
+        self._env_kick_enabled = os.getenv("ENABLE_KICK", "").lower() == "true"
 
         # ── Update rotation manager scene names ──
         self.rotation_manager._scene_stream = SCENE_STREAM
@@ -555,6 +559,10 @@ class AutomationController:
         """Initialize all handler objects after OBS and services are ready."""
         assert self.obs_controller is not None, "OBS controller must be initialized before handlers"
         
+        # A replaced handler's queued/deferred category updates must not
+        # outlive it (they would overwrite the new handler's category)
+        if self.content_switch_handler is not None:
+            self.content_switch_handler.cancel_category_updates()
         self.content_switch_handler = ContentSwitchHandler(
             self.db, self.config_manager, self.playlist_manager,
             self.obs_controller, self.notification_service
@@ -867,15 +875,21 @@ class AutomationController:
             settings = self.config_manager.get_settings()
             video_folder = settings.get('video_folder', DEFAULT_VIDEO_FOLDER)
         
+        category_resolver = (
+            self.content_switch_handler.get_category_for_video
+            if self.content_switch_handler else None
+        )
         if self.playback_monitor is None:
             self.playback_monitor = PlaybackMonitor(
                 self.db, self.obs_controller, VLC_SOURCE_NAME,
                 event_queue=self.obs_connection.media_event_queue,
-                config=self.config_manager, scene_stream=SCENE_STREAM
+                config=self.config_manager, scene_stream=SCENE_STREAM,
+                category_resolver=category_resolver
             )
         else:
-            # Update reference after OBS reconnect (new OBSController instance)
+            # Update references after OBS reconnect (new OBSController / handlers)
             self.playback_monitor.obs_controller = self.obs_controller
+            self.playback_monitor.category_resolver = category_resolver
         
         self.playback_monitor.initialize(str(video_folder))
         
@@ -929,7 +943,7 @@ class AutomationController:
             if not playlists_json:
                 return
 
-            playlist_ids = json.loads(playlists_json)
+            playlist_ids = json_utils.loads(playlists_json)
             playlist_names = []
             for pid in playlist_ids:
                 p = self.db.get_playlist(pid)
@@ -980,7 +994,7 @@ class AutomationController:
             if not playlists_json:
                 return
 
-            playlist_ids: list = json.loads(playlists_json)
+            playlist_ids: list = json_utils.loads(playlists_json)
             if playlist_id not in playlist_ids:
                 return
 
@@ -1048,7 +1062,7 @@ class AutomationController:
             if not playlists_json:
                 return
 
-            playlist_ids = json.loads(playlists_json)
+            playlist_ids = json_utils.loads(playlists_json)
             playlist_names = []
             for pid in playlist_ids:
                 p = self.db.get_playlist(pid)
@@ -1310,7 +1324,7 @@ class AutomationController:
                 
                 if current_video and self.content_switch_handler and self.stream_manager:
                     try:
-                        await self.content_switch_handler.update_category_for_video_async(
+                        self.content_switch_handler.request_category_update(
                             current_video, self.stream_manager
                         )
                         # Optional video transition notification
@@ -1723,6 +1737,10 @@ class AutomationController:
         if self._eventsub_listener:
             await self._eventsub_listener.stop()
 
+        # Stop deferred category updates before the platform clients close
+        if self.content_switch_handler:
+            await self.content_switch_handler.stop()
+
         # Disconnect web dashboard client
         if self.web_dashboard:
             await self.web_dashboard.close()
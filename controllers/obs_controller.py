@@ -3,6 +3,7 @@
 Provides high-level commands for scene switching, VLC source
 management, media playback queries, and connection health checks.
 """
+import asyncio
 import logging
 import time
 import obsws_python as obs
@@ -23,6 +24,12 @@ _CONNECTION_ERROR_HINTS = (
 
 class OBSController:
 
+    # Media states in which VLC no longer holds its files open
+    VLC_RELEASED_STATES = ('OBS_MEDIA_STATE_NONE', 'OBS_MEDIA_STATE_STOPPED', 'OBS_MEDIA_STATE_ENDED')
+    # Polling for VLC release starts fast and backs off to this interval
+    VLC_POLL_INITIAL_INTERVAL = 0.05
+    VLC_POLL_MAX_INTERVAL = 0.4
+
     def __init__(self, obs_client: obs.ReqClient):
         self.obs_client = obs_client
         self._is_connected = True
@@ -433,29 +440,38 @@ class OBSController:
             time.sleep(wait_seconds)
         return success
 
-    def prepare_for_content_switch(self, scene_rotation_screen: str, 
-                                   vlc_source_name: str, wait_seconds: float = 3.0) -> bool:
-        """Prepare for content switch (switch to Rotation screen scene and stop VLC).
+    async def wait_for_vlc_stopped(self, source_name: str, timeout: float = 3.0,
+                                   min_wait: float = 0.0) -> bool:
+        """Wait until a VLC source reports a stopped state.
+        
+        Sleeps ``min_wait`` first, then polls the media state with
+        exponential backoff (from ``VLC_POLL_INITIAL_INTERVAL`` up to
+        ``VLC_POLL_MAX_INTERVAL``) and returns as soon as VLC has released
+        its files, yielding to the event loop between polls.  The floor
+        matters because a source whose last video already ENDED reports a
+        released state before VLC has actually closed the file.
         
         Args:
-            scene_rotation_screen: Name of Rotation screen scene
-            vlc_source_name: Name of VLC source
-            wait_seconds: Seconds to wait for VLC to release file handles
+            source_name: Name of VLC source
+            timeout: Maximum seconds to wait, including ``min_wait``
+            min_wait: Seconds to wait before the first poll
         
         Returns:
-            True if successful
+            True if VLC reported a stopped state, False if the timeout expired
         """
-        # Switch to Rotation screen scene
-        if not self.switch_scene(scene_rotation_screen):
-            return False
-        
-        # Stop VLC source
-        if not self.stop_vlc_source(vlc_source_name):
-            return False
-        
-        # Wait for VLC to release file handles
-        time.sleep(wait_seconds)
-        return True
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + timeout
+        if min_wait > 0:
+            await asyncio.sleep(min(min_wait, timeout))
+        interval = self.VLC_POLL_INITIAL_INTERVAL
+        while True:
+            if self.get_media_state(source_name) in self.VLC_RELEASED_STATES:
+                return True
+            remaining = deadline - loop.time()
+            if remaining <= 0:
+                return False
+            await asyncio.sleep(min(interval, remaining))
+            interval = min(interval * 2, self.VLC_POLL_MAX_INTERVAL)
 
     def finalize_content_switch(self, vlc_source_name: str, video_folder: str,
                                 target_scene: str) -> bool:
@@ -4,18 +4,90 @@ Manages playlists, videos, rotation sessions, playback tracking,
 temp playback state, and platform token storage.
 """
 import sqlite3
-import json
 import os
+import queue
 import threading
 from contextlib import contextmanager
+from pathlib import Path
 from datetime import datetime, timezone
 from typing import Any, List, Dict, Optional
 import logging
 
+from utils import json_utils
+
 logger = logging.getLogger(__name__)
 
+# RETURNING clauses need SQLite 3.35+; older builds fall back to lastrowid/rowcount
+_HAS_RETURNING = sqlite3.sqlite_version_info >= (3, 35, 0)
+
+
+def _sqlite_has_json1() -> bool:
+    """Return True if the linked SQLite provides the JSON1 functions."""
+    try:
+        conn = sqlite3.connect(":memory:")
+        try:
+            conn.execute("SELECT json_patch('{}', '{}')")
+        finally:
+            conn.close()
+        return True
+    except sqlite3.Error:
+        return False
+
+
+# JSON1 is built in from SQLite 3.38 and compiled into most older builds;
+# without it the status column is patched by a read-modify-write in Python
+_HAS_JSON1 = _sqlite_has_json1()
+
+# Temp playback statements run on every save/transition/tick.  Keeping the
+# SQL text identical (one constant each) lets sqlite3's statement cache
+# reuse the prepared statement instead of re-parsing it.
+_SQL_SAVE_TEMP_PLAYBACK = """
+    UPDATE rotation_sessions
+    SET temp_playback_active = 1,
+        temp_playback_playlist = COALESCE(?, temp_playback_playlist),
+        temp_playback_position = COALESCE(?, temp_playback_position),
+        temp_playback_folder = COALESCE(?, temp_playback_folder),
+        temp_playback_cursor_ms = COALESCE(?, 0)
+    WHERE id = ?
+"""
+_SQL_UPDATE_TEMP_PLAYBACK_POSITION = """
+    UPDATE rotation_sessions
+    SET temp_playback_position = ?,
+        temp_playback_cursor_ms = 0
+    WHERE id = ?
+"""
+_SQL_UPDATE_TEMP_PLAYBACK_CURSOR = "UPDATE rotation_sessions SET temp_playback_cursor_ms = ? WHERE id = ?"
+_SQL_CLEAR_TEMP_PLAYBACK = """
+    UPDATE rotation_sessions
+    SET temp_playback_active = 0,
+        temp_playback_playlist = NULL,
+        temp_playback_position = NULL,
+        temp_playback_folder = NULL,
+        temp_playback_cursor_ms = NULL
+    WHERE id = ?
+"""
+
+# Read on every dashboard snapshot
+_SQL_PLAYLIST_STATS = "SELECT name, last_played, play_count FROM playlists"
+
 
 class DatabaseManager:
+
+    # Bump whenever init_database() gains a table, column, or index so
+    # existing databases re-run the (idempotent) schema setup once.
+    SCHEMA_VERSION = 4
+
+    # Maximum number of read-only connections opened for readonly cursors
+    READ_POOL_SIZE = 2
+
+    # Seconds to wait for a pooled reader before falling back to the writer
+    READ_POOL_WAIT = 0.5
+
+    # Maximum values bound into a single IN (...) list
+    SQL_IN_CHUNK_SIZE = 500
+
+    # Prepared statements kept per connection (sqlite3 default is 128)
+    STATEMENT_CACHE_SIZE = 256
     
     @staticmethod
     def parse_json_field(value, default=None) -> Any:
@@ -37,8 +109,8 @@ class DatabaseManager:
             return default
         if isinstance(value, str):
             try:
-                return json.loads(value)
-            except (json.JSONDecodeError, ValueError):
+                return json_utils.loads(value)
+            except ValueError:
                 return default
         return value
 
@@ -51,19 +123,107 @@ class DatabaseManager:
             db_path = os.path.join(core_dir, "stream_data.db")
         
         self.db_path = db_path
-        self._lock = threading.RLock()
+        # Plain Lock (not RLock): no method opens a _cursor() while holding another
+        self._lock = threading.Lock()
         # Persistent connection — check_same_thread=False since we protect with _lock
-        self.conn = sqlite3.connect(db_path, check_same_thread=False)
+        self.conn = sqlite3.connect(db_path, check_same_thread=False,
+                                    cached_statements=self.STATEMENT_CACHE_SIZE)
         self.conn.row_factory = sqlite3.Row
-        self.init_database()
+        self._apply_pragmas()
+        # Read-only connections, opened lazily; readers don't take _lock
+        self._read_pool: queue.Queue = queue.Queue()
+        self._read_conns: List[sqlite3.Connection] = []
+        self._read_pool_lock = threading.Lock()
+        # Skip the CREATE/ALTER pass entirely when the schema is already current
+        user_version = self.conn.execute("PRAGMA user_version").fetchone()[0]
+        if user_version != self.SCHEMA_VERSION:
+            self.init_database()
+
+    def _apply_pragmas(self) -> None:
+        """Tune the connection for frequent small writes.
+
+        WAL lets readers proceed while the per-second playback writes are
+        in flight, and synchronous=NORMAL drops the fsync on every commit
+        (WAL stays consistent; only the last commits can be lost on power
+        failure, which the crash-recovery state tolerates).
+        """
+        try:
+            self.conn.execute("PRAGMA journal_mode=WAL")
+            self.conn.execute("PRAGMA synchronous=NORMAL")
+            self.conn.execute("PRAGMA busy_timeout=5000")
+            self.conn.execute("PRAGMA temp_store=MEMORY")
+            self.conn.execute("PRAGMA cache_size=-20000")
+            self.conn.execute("PRAGMA wal_autocheckpoint=1000")
+        except sqlite3.Error as e:
+            logger.warning(f"Failed to apply SQLite PRAGMAs: {e}")
+
+    def _acquire_reader(self) -> Optional[sqlite3.Connection]:
+        """Check out a read-only connection, opening one if the pool has room.
+
+        Returns None if no read-only connection could be opened, in which
+        case the caller should fall back to the writer connection.
+        """
+        try:
+            return self._read_pool.get_nowait()
+        except queue.Empty:
+            pass
+        with self._read_pool_lock:
+            if self.conn is None:
+                raise RuntimeError("Database connection is closed")
+            if len(self._read_conns) < self.READ_POOL_SIZE:
+                try:
+                    uri = f"{Path(self.db_path).resolve().as_uri()}?mode=ro"
+                    conn = sqlite3.connect(uri, uri=True, check_same_thread=False)
+                    conn.row_factory = sqlite3.Row
+                    conn.execute("PRAGMA busy_timeout=5000")
+                except sqlite3.Error as e:
+                    logger.warning(f"Failed to open read-only database connection: {e}")
+                    return None
+                self._read_conns.append(conn)
+                return conn
+        # Pool is full — wait briefly for another reader to hand one back
+        try:
+            return self._read_pool.get(timeout=self.READ_POOL_WAIT)
+        except queue.Empty:
+            logger.debug("Read pool exhausted, falling back to the writer connection")
+            return None
+
+    def _release_reader(self, conn: sqlite3.Connection) -> None:
+        """Return a checked-out reader to the pool.
+
+        Readers dropped by :meth:`close` while checked out are closed
+        instead of re-queued.
+        """
+        with self._read_pool_lock:
+            if conn in self._read_conns:
+                self._read_pool.put(conn)
+                return
+        conn.close()
 
     @contextmanager
-    def _cursor(self):
+    def _cursor(self, readonly: bool = False):
         """Thread-safe cursor context manager.
         
         Acquires the lock, yields a cursor, and commits on success.
-        Uses RLock so nested calls (e.g., log_playback -> get_video_by_filename) are safe.
+        The lock is not reentrant — never call another DatabaseManager
+        method from inside a ``_cursor()`` block.
+
+        With ``readonly=True`` the cursor comes from a pooled read-only
+        connection instead, so SELECTs don't wait behind writes (WAL gives
+        each read a consistent snapshot).  Never write through it.
         """
+        if readonly:
+            reader = self._acquire_reader()
+            if reader is not None:
+                cursor = reader.cursor()
+                try:
+                    yield cursor
+                finally:
+                    # Close so the read snapshot is released before reuse
+                    cursor.close()
+                    self._release_reader(reader)
+                return
+
         with self._lock:
             if self.conn is None:
                 raise RuntimeError("Database connection is closed")
@@ -81,6 +241,14 @@ class DatabaseManager:
             if self.conn:
                 self.conn.close()
                 self.conn = None
+        with self._read_pool_lock:
+            # Idle readers close now; checked-out ones close on release
+            self._read_conns.clear()
+            while True:
+                try:
+                    self._read_pool.get_nowait().close()
+                except queue.Empty:
+                    break
 
     def init_database(self):
         """Initialize database tables."""
@@ -210,6 +378,25 @@ class DatabaseManager:
             except sqlite3.OperationalError:
                 logger.debug("playback_current_video column already exists")
 
+            # Lookups and renames by playlist name
+            cursor.execute("""
+                CREATE INDEX IF NOT EXISTS idx_videos_playlist_name
+                ON videos(playlist_name)
+            """)
+
+            # Lookups by filename on every video transition — UNIQUE(playlist_id, filename)
+            # leads with playlist_id, so it can't serve "WHERE filename = ?"
+            cursor.execute("""
+                CREATE INDEX IF NOT EXISTS idx_videos_filename
+                ON videos(filename)
+            """)
+
+            # Partial index so "WHERE is_current = 1" touches only the current session
+            cursor.execute("""
+                CREATE INDEX IF NOT EXISTS idx_sessions_current
+                ON rotation_sessions(is_current) WHERE is_current = 1
+            """)
+
             # Playback log table - records each video transition for historical audit
             cursor.execute("""
                 CREATE TABLE IF NOT EXISTS playback_log (
@@ -224,6 +411,8 @@ class DatabaseManager:
                 )
             """)
 
+            # PRAGMA does not accept bound parameters; value is a class constant
+            cursor.execute(f"PRAGMA user_version = {int(self.SCHEMA_VERSION)}")
             logger.info("Database initialized successfully")
 
     def add_playlist(self, name: str, youtube_url: str, enabled: bool = True, priority: int = 1) -> Optional[int]:
@@ -244,7 +433,7 @@ class DatabaseManager:
 
     def get_enabled_playlists(self) -> List[Dict]:
         """Get all enabled playlists."""
-        with self._cursor() as cursor:
+        with self._cursor(readonly=True) as cursor:
             cursor.execute("""
                 SELECT * FROM playlists 
                 WHERE enabled = 1
@@ -254,9 +443,22 @@ class DatabaseManager:
             playlists = [dict(row) for row in cursor.fetchall()]
             return playlists
 
+    def get_playlist_stats(self) -> Dict[str, Dict]:
+        """Play statistics for every playlist (enabled or not), keyed by name.
+
+        Returns:
+            ``{name: {"last_played": ..., "play_count": int}}``
+        """
+        with self._cursor(readonly=True) as cursor:
+            cursor.execute(_SQL_PLAYLIST_STATS)
+            return {
+                name: {"last_played": last_played, "play_count": play_count or 0}
+                for name, last_played, play_count in cursor.fetchall()
+            }
+
     def get_playlist(self, playlist_id: int) -> Optional[Dict]:
         """Get a specific playlist by ID."""
-        with self._cursor() as cursor:
+        with self._cursor(readonly=True) as cursor:
             cursor.execute("SELECT * FROM playlists WHERE id = ?", (playlist_id,))
             row = cursor.fetchone()
 
@@ -264,35 +466,69 @@ class DatabaseManager:
                 return dict(row)
             return None
 
+    def get_playlists_by_ids(self, playlist_ids: List[int]) -> List[Dict]:
+        """Get several playlists by ID in one query, in the caller's order.
+
+        IDs that don't exist are skipped.
+        """
+        if not playlist_ids:
+            return []
+
+        with self._cursor(readonly=True) as cursor:
+            placeholders = ','.join('?' * len(playlist_ids))
+            cursor.execute(f"SELECT * FROM playlists WHERE id IN ({placeholders})", list(playlist_ids))
+            by_id = {row['id']: dict(row) for row in cursor.fetchall()}
+        return [by_id[pid] for pid in playlist_ids if pid in by_id]
+
     def update_playlist_played(self, playlist_id: int):
         """Update playlist's last_played timestamp and increment play_count."""
+        self.update_playlists_played([playlist_id])
+
+    def update_playlists_played(self, playlist_ids: List[int]) -> None:
+        """Mark several playlists as played in one UPDATE and one commit.
+
+        Sets last_played/updated_at to the same timestamp for all of them
+        and increments each play_count.
+        """
+        if not playlist_ids:
+            return
+        now = datetime.now(timezone.utc)
+        placeholders = ','.join('?' * len(playlist_ids))
         with self._cursor() as cursor:
-            cursor.execute("""
+            cursor.execute(f"""
                 UPDATE playlists 
                 SET last_played = ?, 
                     play_count = play_count + 1,
                     updated_at = ?
-                WHERE id = ?
-            """, (datetime.now(timezone.utc), datetime.now(timezone.utc), playlist_id))
+                WHERE id IN ({placeholders})
+            """, (now, now, *playlist_ids))
 
     def mark_playlist_played_for_video(self, video_filename: str) -> Optional[str]:
         """Mark the playlist that owns *video_filename* as played.
 
-        Looks up the video in the database, finds its playlist, and calls
-        :meth:`update_playlist_played`.  Returns the playlist name on
-        success (for logging) or ``None`` if the video/playlist could not
-        be resolved.
+        Looks up the video's playlist and updates it (as
+        :meth:`update_playlist_played` does) in one transaction.  Returns
+        the playlist name on success (for logging) or ``None`` if the
+        video/playlist could not be resolved.
         """
         try:
-            video = self.get_video_by_filename(video_filename)
-            if not video:
-                return None
-            playlist_id = video.get('playlist_id')
-            playlist_name = video.get('playlist_name')
-            if not playlist_id:
-                return None
-            self.update_playlist_played(playlist_id)
-            return playlist_name
+            with self._cursor() as cursor:
+                cursor.execute(
+                    "SELECT playlist_id, playlist_name FROM videos WHERE filename = ? LIMIT 1",
+                    (video_filename,)
+                )
+                video = cursor.fetchone()
+                if not video or not video['playlist_id']:
+                    return None
+                now = datetime.now(timezone.utc)
+                cursor.execute("""
+                    UPDATE playlists 
+                    SET last_played = ?, 
+                        play_count = play_count + 1,
+                        updated_at = ?
+                    WHERE id = ?
+                """, (now, now, video['playlist_id']))
+                return video['playlist_name']
         except Exception as e:
             logger.warning(f"Failed to mark playlist played for video {video_filename}: {e}")
             return None
@@ -307,19 +543,20 @@ class DatabaseManager:
         """
         with self._cursor() as cursor:
             try:
-                # Look up video_id and playlist_name from videos table
-                video_id = None
-                playlist_name = None
-                video = self.get_video_by_filename(video_filename)
-                if video:
-                    video_id = video.get('id')
-                    playlist_name = video.get('playlist_name')
-
+                # Resolve video_id and playlist_name from the videos table in the same statement
                 cursor.execute("""
                     INSERT INTO playback_log (video_id, session_id, video_filename, playlist_name)
-                    VALUES (?, ?, ?, ?)
-                """, (video_id, session_id, video_filename, playlist_name))
-                logger.debug(f"Logged playback: {video_filename} (playlist={playlist_name})")
+                    SELECT id, ?, ?, playlist_name FROM videos
+                    WHERE filename = ?
+                    LIMIT 1
+                """, (session_id, video_filename, video_filename))
+                if cursor.rowcount == 0:
+                    # Video not registered — still record the event without a link
+                    cursor.execute("""
+                        INSERT INTO playback_log (video_id, session_id, video_filename, playlist_name)
+                        VALUES (NULL, ?, ?, NULL)
+                    """, (session_id, video_filename))
+                logger.debug("Logged playback: %s", video_filename)
             except Exception as e:
                 logger.warning(f"Failed to log playback for {video_filename}: {e}")
 
@@ -357,9 +594,34 @@ class DatabaseManager:
                 """, (playlist_id, filename))
                 return cursor.fetchone()[0]
 
+    def register_videos_bulk(self, videos: List[Dict]) -> List[Dict]:
+        """Insert many videos in a single transaction, skipping ones already registered.
+        
+        Args:
+            videos: Dicts with playlist_id, filename, title, duration_seconds,
+                file_size_mb and optional playlist_name (as produced by
+                VideoRegistrationQueue)
+        
+        Returns:
+            The subset of *videos* that was newly inserted
+        """
+        inserted = []
+        if not videos:
+            return inserted
+        with self._cursor() as cursor:
+            for v in videos:
+                cursor.execute("""
+                    INSERT OR IGNORE INTO videos (playlist_id, playlist_name, filename, title, file_size_mb, duration_seconds)
+                    VALUES (?, ?, ?, ?, ?, ?)
+                """, (v['playlist_id'], v.get('playlist_name'), v['filename'], v.get('title'),
+                      v.get('file_size_mb'), v.get('duration_seconds')))
+                if cursor.rowcount > 0:
+                    inserted.append(v)
+        return inserted
+
     def get_videos_by_playlist(self, playlist_id: int) -> List[Dict]:
         """Get all videos for a specific playlist."""
-        with self._cursor() as cursor:
+        with self._cursor(readonly=True) as cursor:
             cursor.execute("""
                 SELECT * FROM videos 
                 WHERE playlist_id = ?
@@ -383,7 +645,7 @@ class DatabaseManager:
         Returns:
             Video dict with playlist_name, or None if not found
         """
-        with self._cursor() as cursor:
+        with self._cursor(readonly=True) as cursor:
             # Prefer a record from one of the requested playlists
             if playlist_names:
                 placeholders = ','.join('?' * len(playlist_names))
@@ -409,6 +671,35 @@ class DatabaseManager:
                 return dict(row)
             return None
 
+    def get_playlist_names_for_videos(self, filenames: List[str]) -> Dict[str, str]:
+        """Map video filenames to their source playlist name in bulk.
+
+        Filenames not in the database (or without a playlist name) are
+        omitted.  If a filename was registered under several playlists the
+        earliest registration wins, like ``get_video_by_filename``.
+
+        Args:
+            filenames: Video filenames (without ordering prefix)
+
+        Returns:
+            Dictionary mapping filename to playlist_name
+        """
+        result: Dict[str, str] = {}
+        unique = list(dict.fromkeys(filenames))
+        with self._cursor(readonly=True) as cursor:
+            # Stay well under SQLite's bound-parameter limit on old builds (999)
+            for start in range(0, len(unique), self.SQL_IN_CHUNK_SIZE):
+                chunk = unique[start:start + self.SQL_IN_CHUNK_SIZE]
+                placeholders = ','.join('?' * len(chunk))
+                cursor.execute(f"""
+                    SELECT filename, playlist_name FROM videos
+                    WHERE filename IN ({placeholders}) AND playlist_name IS NOT NULL
+                    ORDER BY id
+                """, chunk)
+                for filename, playlist_name in cursor.fetchall():
+                    result.setdefault(filename, playlist_name)
+        return result
+
     def create_rotation_session(self, playlists_selected: List[int],
                                 stream_title: str,
                                 total_duration_seconds: int = 0) -> Optional[int]:
@@ -428,13 +719,18 @@ class DatabaseManager:
             """)
 
             # Create new session with clean state (next_playlists starts null)
-            cursor.execute("""
+            insert_sql = """
                 INSERT INTO rotation_sessions (playlists_selected, stream_title, total_duration_seconds, 
                                               is_current, current_playlists, next_playlists)
                 VALUES (?, ?, ?, 1, NULL, NULL)
-            """, (json.dumps(playlists_selected), stream_title, total_duration_seconds))
-
-            session_id = cursor.lastrowid
+            """
+            params = (json_utils.dumps(playlists_selected), stream_title, total_duration_seconds)
+            if _HAS_RETURNING:
+                cursor.execute(insert_sql + " RETURNING id", params)
+                session_id = cursor.fetchone()[0]
+            else:
+                cursor.execute(insert_sql, params)
+                session_id = cursor.lastrowid
             logger.info(f"Created new rotation session {session_id} (marked previous sessions as inactive)")
             return session_id
 
@@ -456,7 +752,7 @@ class DatabaseManager:
         with self._cursor() as cursor:
             cursor.execute("""
                 UPDATE rotation_sessions SET playlists_selected = ? WHERE id = ?
-            """, (json.dumps(playlist_ids), session_id))
+            """, (json_utils.dumps(playlist_ids), session_id))
 
     def save_playback_position(self, session_id: int, cursor_ms: int, current_video: Optional[str] = None) -> None:
         """Save the current playback position for crash recovery.
@@ -476,7 +772,7 @@ class DatabaseManager:
                     WHERE id = ?
                 """, (cursor_ms, current_video, session_id))
             except Exception as e:
-                logger.debug(f"Failed to save playback position: {e}")
+                logger.debug("Failed to save playback position: %s", e)
 
     def clear_playback_position(self, session_id: int) -> None:
         """Clear saved playback position (e.g. on rotation switch)."""
@@ -484,7 +780,7 @@ class DatabaseManager:
 
     def get_session_by_id(self, session_id: int) -> Optional[Dict]:
         """Get a specific session by ID."""
-        with self._cursor() as cursor:
+        with self._cursor(readonly=True) as cursor:
             cursor.execute("""
                 SELECT * FROM rotation_sessions 
                 WHERE id = ?
@@ -498,7 +794,7 @@ class DatabaseManager:
 
     def get_current_session(self) -> Optional[Dict]:
         """Get the current active rotation session."""
-        with self._cursor() as cursor:
+        with self._cursor(readonly=True) as cursor:
             cursor.execute("""
                 SELECT * FROM rotation_sessions 
                 WHERE is_current = 1 
@@ -584,29 +880,41 @@ class DatabaseManager:
         """
         with self._cursor() as cursor:
             try:
-                # Get current status
-                cursor.execute("SELECT next_playlists_status FROM rotation_sessions WHERE id = ?", (session_id,))
-                row = cursor.fetchone()
-
-                if row and row[0]:
-                    status_dict = json.loads(row[0])
-                else:
-                    status_dict = {}
-
-                # Update the status for this playlist
-                status_dict[playlist_name] = status
-
-                # Save back to database
-                cursor.execute(
-                    "UPDATE rotation_sessions SET next_playlists_status = ? WHERE id = ?",
-                    (json.dumps(status_dict), session_id)
-                )
-                logger.debug(f"Updated playlist '{playlist_name}' to {status} in session {session_id}")
+                self._patch_playlist_status(cursor, session_id, {playlist_name: status})
+                logger.debug("Updated playlist '%s' to %s in session %s", playlist_name, status, session_id)
                 return True
             except Exception as e:
                 logger.error(f"Failed to update playlist status: {e}")
                 return False
 
+    @staticmethod
+    def _patch_playlist_status(cursor, session_id: int, updates: Dict[str, str]) -> None:
+        """Merge ``updates`` into a session's next_playlists_status.
+
+        With JSON1 this is a single UPDATE using json_patch, so the stored
+        value is never read back into Python.  Caller must be inside a
+        ``_cursor()`` block.
+        """
+        if _HAS_JSON1:
+            cursor.execute(
+                """
+                UPDATE rotation_sessions
+                SET next_playlists_status = json_patch(COALESCE(NULLIF(next_playlists_status, ''), '{}'), ?)
+                WHERE id = ?
+                """,
+                (json_utils.dumps(updates), session_id)
+            )
+            return
+
+        cursor.execute("SELECT next_playlists_status FROM rotation_sessions WHERE id = ?", (session_id,))
+        row = cursor.fetchone()
+        status_dict = json_utils.loads(row[0]) if row and row[0] else {}
+        status_dict.update(updates)
+        cursor.execute(
+            "UPDATE rotation_sessions SET next_playlists_status = ? WHERE id = ?",
+            (json_utils.dumps(status_dict), session_id)
+        )
+
     def set_next_playlists(self, session_id: int, playlists: List[str]) -> bool:
         """Set the list of next playlists and initialize their status to PENDING.
         
@@ -622,17 +930,17 @@ class DatabaseManager:
                 # Store playlist names
                 cursor.execute(
                     "UPDATE rotation_sessions SET next_playlists = ? WHERE id = ?",
-                    (json.dumps(playlists), session_id)
+                    (json_utils.dumps(playlists), session_id)
                 )
 
                 # Initialize all playlists as PENDING
                 status_dict = {pl: "PENDING" for pl in playlists}
                 cursor.execute(
                     "UPDATE rotation_sessions SET next_playlists_status = ? WHERE id = ?",
-                    (json.dumps(status_dict), session_id)
+                    (json_utils.dumps(status_dict), session_id)
                 )
 
-                logger.debug(f"Set next_playlists to {playlists} in session {session_id}")
+                logger.debug("Set next_playlists to %s in session %s", playlists, session_id)
                 return True
             except Exception as e:
                 logger.error(f"Failed to set next playlists: {e}")
@@ -652,9 +960,9 @@ class DatabaseManager:
             try:
                 cursor.execute(
                     "UPDATE rotation_sessions SET current_playlists = ? WHERE id = ?",
-                    (json.dumps(playlists), session_id)
+                    (json_utils.dumps(playlists), session_id)
                 )
-                logger.debug(f"Set current_playlists to {playlists} in session {session_id}")
+                logger.debug("Set current_playlists to %s in session %s", playlists, session_id)
                 return True
             except Exception as e:
                 logger.error(f"Failed to set current playlists: {e}")
@@ -670,13 +978,13 @@ class DatabaseManager:
         Returns:
             Status string ("PENDING", "COMPLETED", etc.) or None
         """
-        with self._cursor() as cursor:
+        with self._cursor(readonly=True) as cursor:
             try:
                 cursor.execute("SELECT next_playlists_status FROM rotation_sessions WHERE id = ?", (session_id,))
                 row = cursor.fetchone()
 
                 if row and row[0]:
-                    status_dict = json.loads(row[0])
+                    status_dict = json_utils.loads(row[0])
                     return status_dict.get(playlist_name)
                 return None
             except Exception as e:
@@ -692,13 +1000,13 @@ class DatabaseManager:
         Returns:
             Dictionary mapping playlist names to their status
         """
-        with self._cursor() as cursor:
+        with self._cursor(readonly=True) as cursor:
             try:
                 cursor.execute("SELECT next_playlists_status FROM rotation_sessions WHERE id = ?", (session_id,))
                 row = cursor.fetchone()
 
                 if row and row[0]:
-                    return json.loads(row[0])
+                    return json_utils.loads(row[0])
                 return {}
             except Exception as e:
                 logger.error(f"Failed to get next playlists status: {e}")
@@ -762,8 +1070,10 @@ class DatabaseManager:
             return False
         
         try:
-            for playlist_name in playlist_names:
-                self.update_playlist_status(session_id, playlist_name, "COMPLETED")
+            with self._cursor() as cursor:
+                self._patch_playlist_status(
+                    cursor, session_id, {name: "COMPLETED" for name in playlist_names}
+                )
             logger.info(f"Updated database: marked {playlist_names} as COMPLETED in session {session_id}")
             return True
         except Exception as e:
@@ -779,21 +1089,25 @@ class DatabaseManager:
         if not playlist_names:
             return []
         
-        with self._cursor() as cursor:
+        with self._cursor(readonly=True) as cursor:
             try:
-                playlists = []
-                for name in playlist_names:
-                    cursor.execute("SELECT * FROM playlists WHERE name = ?", (name,))
-                    row = cursor.fetchone()
-                    if row:
-                        playlists.append(dict(row))
-                return playlists
+                placeholders = ','.join('?' * len(playlist_names))
+                cursor.execute(f"SELECT * FROM playlists WHERE name IN ({placeholders})", playlist_names)
+                by_name = {row['name']: dict(row) for row in cursor.fetchall()}
+                # Preserve the caller's ordering
+                return [by_name[name] for name in playlist_names if name in by_name]
             except Exception as e:
                 logger.error(f"Failed to get playlists with IDs by names: {e}")
                 return []
 
-    def save_temp_playback_state(self, session_id: int, playlist: List[str], position: int, folder: str, cursor_ms: int = 0) -> bool:
-        """Save temp playback state for crash recovery.
+    def save_temp_playback_state(self, session_id: int, playlist: Optional[List[str]] = None,
+                                 position: Optional[int] = None, folder: Optional[str] = None,
+                                 cursor_ms: Optional[int] = None) -> bool:
+        """Save temp playback state for crash recovery in a single UPDATE.
+        
+        Marks temp playback active.  Fields passed as None keep their stored
+        value, except ``cursor_ms`` which resets to 0 (a new state or
+        position always starts at the beginning of the video).
         
         Args:
             session_id: Session ID
@@ -803,20 +1117,17 @@ class DatabaseManager:
             cursor_ms: Current playback position within the video in milliseconds
         
         Returns:
-            True if saved successfully
+            True if saved successfully, False on error or unknown session
         """
+        playlist_json = json_utils.dumps(playlist) if playlist is not None else None
         with self._cursor() as cursor:
             try:
-                cursor.execute("""
-                    UPDATE rotation_sessions 
-                    SET temp_playback_active = 1,
-                        temp_playback_playlist = ?,
-                        temp_playback_position = ?,
-                        temp_playback_folder = ?,
-                        temp_playback_cursor_ms = ?
-                    WHERE id = ?
-                """, (json.dumps(playlist), position, folder, cursor_ms, session_id))
-                logger.info(f"Saved temp playback state: {len(playlist)} videos, position={position}, cursor={cursor_ms}ms")
+                cursor.execute(_SQL_SAVE_TEMP_PLAYBACK, (playlist_json, position, folder, cursor_ms, session_id))
+                if cursor.rowcount == 0:
+                    logger.warning(f"Cannot save temp playback state: session {session_id} not found")
+                    return False
+                if playlist is not None:
+                    logger.info("Saved temp playback state: %d videos, position=%s, cursor=%dms", len(playlist), position, cursor_ms or 0)
                 return True
             except Exception as e:
                 logger.error(f"Failed to save temp playback state: {e}")
@@ -830,17 +1141,12 @@ class DatabaseManager:
             position: New position in the playlist
         
         Returns:
-            True if updated successfully
+            True if updated successfully, False on error or unknown session
         """
         with self._cursor() as cursor:
             try:
-                cursor.execute("""
-                    UPDATE rotation_sessions 
-                    SET temp_playback_position = ?,
-                        temp_playback_cursor_ms = 0
-                    WHERE id = ?
-                """, (position, session_id))
-                return True
+                cursor.execute(_SQL_UPDATE_TEMP_PLAYBACK_POSITION, (position, session_id))
+                return cursor.rowcount > 0
             except Exception as e:
                 logger.error(f"Failed to update temp playback position: {e}")
                 return False
@@ -857,11 +1163,7 @@ class DatabaseManager:
         """
         with self._cursor() as cursor:
             try:
-                cursor.execute("""
-                    UPDATE rotation_sessions 
-                    SET temp_playback_cursor_ms = ?
-                    WHERE id = ?
-                """, (cursor_ms, session_id))
+                cursor.execute(_SQL_UPDATE_TEMP_PLAYBACK_CURSOR, (cursor_ms, session_id))
                 return True
             except Exception as e:
                 logger.error(f"Failed to update temp playback cursor: {e}")
@@ -874,20 +1176,14 @@ class DatabaseManager:
             session_id: Session ID
         
         Returns:
-            True if cleared successfully
+            True if cleared successfully, False on error or unknown session
         """
         with self._cursor() as cursor:
             try:
-                cursor.execute("""
-                    UPDATE rotation_sessions 
-                    SET temp_playback_active = 0,
-                        temp_playback_playlist = NULL,
-                        temp_playback_position = NULL,
-                        temp_playback_folder = NULL,
-                        temp_playback_cursor_ms = NULL
-                    WHERE id = ?
-                """, (session_id,))
-                logger.info(f"Cleared temp playback state for session {session_id}")
+                cursor.execute(_SQL_CLEAR_TEMP_PLAYBACK, (session_id,))
+                if cursor.rowcount == 0:
+                    return False
+                logger.info("Cleared temp playback state for session %s", session_id)
                 return True
             except Exception as e:
                 logger.error(f"Failed to clear temp playback state: {e}")
@@ -913,7 +1209,7 @@ class DatabaseManager:
                 row = cursor.fetchone()
 
                 if row and row[0]:  # temp_playback_active is True
-                    playlist = json.loads(row[1]) if row[1] else []
+                    playlist = json_utils.loads(row[1]) if row[1] else []
                     return {
                         'active': True,
                         'playlist': playlist,
@@ -944,21 +1240,24 @@ class DatabaseManager:
         from config.constants import VIDEO_EXTENSIONS
         
         try:
-            if not os.path.exists(pending_folder):
+            # Let scandir report a missing folder rather than stat-ing it first.
+            # is_file() uses the cached dirent type — no stat per entry
+            try:
+                with os.scandir(pending_folder) as entries:
+                    video_count = sum(
+                        1 for entry in entries
+                        if entry.is_file()
+                        and os.path.splitext(entry.name)[1].lower() in VIDEO_EXTENSIONS
+                    )
+            except (FileNotFoundError, NotADirectoryError):
                 logger.warning(f"Pending folder does not exist: {pending_folder}")
                 return False
 
-            video_files = [
-                f for f in os.listdir(pending_folder)
-                if os.path.isfile(os.path.join(pending_folder, f))
-                and os.path.splitext(f)[1].lower() in VIDEO_EXTENSIONS
-            ]
-
-            if not video_files:
+            if not video_count:
                 logger.warning(f"No video files found in pending folder: {pending_folder}")
                 return False
 
-            logger.info(f"Validated {len(video_files)} prepared playlist files exist in pending folder")
+            logger.info(f"Validated {video_count} prepared playlist files exist in pending folder")
             return True
 
         except Exception as e:
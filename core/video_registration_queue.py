@@ -37,7 +37,7 @@ class VideoRegistrationQueue:
             'playlist_name': playlist_name
         }
         self._queue.put(video_data)
-        logger.debug(f"Queued video for registration: {filename}")
+        logger.debug("Queued video for registration: %s", filename)
     
     def get_pending_videos(self) -> list:
         """
@@ -48,14 +48,17 @@ class VideoRegistrationQueue:
         Returns:
             List of video data dictionaries
         """
+        return self._drain()
+    
+    def _drain(self) -> list:
+        """Take every item currently in the queue and return them in order."""
         pending = []
-        try:
-            while True:
-                video_data = self._queue.get_nowait()
-                pending.append(video_data)
-        except queue.Empty:
-            pass
-        
+        while True:
+            try:
+                pending.append(self._queue.get_nowait())
+            except queue.Empty:
+                break
+            self._queue.task_done()
         return pending
     
     def has_pending_videos(self) -> bool:
@@ -64,9 +67,5 @@ class VideoRegistrationQueue:
     
     def clear(self):
         """Clear all pending videos from the queue."""
-        try:
-            while True:
-                self._queue.get_nowait()
-        except queue.Empty:
-            pass
+        self._drain()
         logger.debug("Video registration queue cleared")
@@ -4,24 +4,89 @@ Manages the folder swap, VLC source reload, scene switching,
 and stream metadata updates during a content rotation.
 """
 import asyncio
-import json
+import functools
 import logging
+import math
 import time
+from collections import OrderedDict
 from typing import Optional
 from core.database import DatabaseManager
 from config.config_manager import ConfigManager
 from managers.playlist_manager import PlaylistManager
 from controllers.obs_controller import OBSController
 from services.notification_service import NotificationService
-from utils.video_utils import strip_ordering_prefix, resolve_category_for_video, resolve_playlist_categories, get_video_files_sorted
+from utils import json_utils
+from utils.video_utils import strip_ordering_prefix, resolve_playlist_categories, get_video_files_sorted, get_first_video_sorted
 
 logger = logging.getLogger(__name__)
 
+# Separator between the template and playlist names in stream titles
+TITLE_SEPARATOR = ' | '
+_TITLE_SEPARATOR_LEN = len(TITLE_SEPARATOR)
+
+
+@functools.lru_cache(maxsize=8)
+def _truncate_title(title: str, limit: int) -> str:
+    """Drop trailing " | playlist" parts from ``title`` until it fits ``limit``.
+
+    Cached: the same session title is truncated on every metadata update.
+    """
+    if len(title) <= limit:
+        return title
+
+    # Title is too long, need to truncate by removing playlists from the end
+    # Format is typically: "TEMPLATE | PLAYLIST1 | PLAYLIST2 | ..."
+    # The result is always a prefix of the title ending just before a
+    # " | ".  Separators are walked without overlap, on the same boundaries
+    # str.split() uses, so names starting or ending with "|" stay whole.
+    sep = title.find(TITLE_SEPARATOR)
+    if sep < 0:
+        # Can't parse, just truncate to limit
+        logger.warning(f"Could not parse title for truncation: {title[:50]}...")
+        return title[:limit]
+
+    # Always keep the template part, then extend while the next part fits
+    cut = sep
+    nxt = title.find(TITLE_SEPARATOR, sep + _TITLE_SEPARATOR_LEN)
+    while 0 <= nxt <= limit:
+        cut = nxt
+        nxt = title.find(TITLE_SEPARATOR, nxt + _TITLE_SEPARATOR_LEN)
+    result = title[:cut]
+
+    logger.info("Truncated title from %d to %d chars: %s", len(title), len(result), result)
+    return result
+
 
 class ContentSwitchHandler:
 
+    __slots__ = (
+        'db', 'config', 'playlist_manager', 'obs_controller', 'notification_service',
+        '_last_category_update_time', '_pending_category', '_category_flush_handle',
+        '_category_flush_task', '_category_queue', '_category_consumer_task',
+        '_video_playlist_index', '_session_playlists_cache',
+        '_playlist_category_cache', '_playlist_category_source', '_video_lookup_cache',
+    )
+
     MAX_TITLE_LENGTH = 140  # Kick's title character limit
 
+    # Upper bound (seconds) on waiting for VLC to release the old files
+    VLC_RELEASE_TIMEOUT = 3.0
+    # Lower bound (seconds): ENDED/NONE states are reported before VLC closes the file
+    VLC_RELEASE_MIN_WAIT = 1.0
+
+    # Minimum seconds between category updates sent on video transitions
+    CATEGORY_UPDATE_COOLDOWN = 3.0
+
+    # Video transitions buffered for the category consumer before the oldest is dropped
+    CATEGORY_QUEUE_SIZE = 8
+
+    # Bounded TTL cache of filename -> playlist name for videos outside the rotation index
+    VIDEO_LOOKUP_CACHE_SIZE = 64
+    VIDEO_LOOKUP_CACHE_TTL = 30.0
+
+    # Number of resolved session playlist lists kept by get_session_playlists()
+    SESSION_PLAYLISTS_CACHE_SIZE = 4
+
     def __init__(self, db: DatabaseManager, config: ConfigManager,
                  playlist_manager: PlaylistManager, obs_controller: OBSController,
                  notification_service: NotificationService):
@@ -40,7 +105,58 @@ class ContentSwitchHandler:
         self.playlist_manager = playlist_manager
         self.obs_controller = obs_controller
         self.notification_service = notification_service
-        self._last_category_update_time = 0  # Track last category update to throttle spam
+        # Loop (monotonic) time of the last category update; -inf so the first is never throttled
+        self._last_category_update_time = -math.inf
+        # Latest category requested during the cooldown; sent when it ends
+        self._pending_category: Optional[tuple] = None  # (category, video_filename, stream_manager)
+        self._category_flush_handle: Optional[asyncio.TimerHandle] = None
+        self._category_flush_task: Optional[asyncio.Task] = None
+        # Video transitions waiting for the category consumer (started lazily)
+        self._category_queue: Optional[asyncio.Queue] = None
+        self._category_consumer_task: Optional[asyncio.Task] = None
+        # Original filename -> playlist name for the current rotation's videos
+        self._video_playlist_index: dict[str, str] = {}
+        # Filename -> (expiry, playlist name) for DB lookups of non-indexed videos
+        self._video_lookup_cache: OrderedDict = OrderedDict()
+        # Playlist name -> resolved per-platform categories, rebuilt when the config reloads
+        self._playlist_category_cache: dict[str, Optional[dict[str, str]]] = {}
+        self._playlist_category_source: Optional[list] = None
+        # (session id, playlists_selected) -> (config playlists list, resolved playlists)
+        self._session_playlists_cache: OrderedDict = OrderedDict()
+
+    def get_session_playlists(self, session: dict) -> list:
+        """
+        Get the playlists selected for a session, parsing and resolving them once.
+        
+        Results are cached by session id and the raw ``playlists_selected``
+        string.  An entry is only reused while the config's playlist list is
+        unchanged, so edits to playlists.json (renames, categories) are
+        picked up on the next call.
+        
+        Args:
+            session: Session row (as returned by the database)
+            
+        Returns:
+            List of playlist config dicts (enriched with ``id``), empty if none selected
+        """
+        playlists_selected = session.get('playlists_selected') or ''
+        if not playlists_selected:
+            return []
+        
+        config_playlists = self.config.get_playlists()
+        key = (session.get('id'), playlists_selected)
+        cached = self._session_playlists_cache.get(key)
+        if cached is not None and cached[0] is config_playlists:
+            self._session_playlists_cache.move_to_end(key)
+            return cached[1]
+        
+        playlist_ids = json_utils.loads(playlists_selected)
+        playlists = self.playlist_manager.get_playlists_by_ids(playlist_ids)
+        self._session_playlists_cache[key] = (config_playlists, playlists)
+        self._session_playlists_cache.move_to_end(key)
+        while len(self._session_playlists_cache) > self.SESSION_PLAYLISTS_CACHE_SIZE:
+            self._session_playlists_cache.popitem(last=False)
+        return playlists
 
     def get_category_for_video(self, video_filename: str) -> Optional[dict[str, str]]:
         """
@@ -52,7 +168,104 @@ class ContentSwitchHandler:
         Returns:
             ``{"twitch": "...", "kick": "..."}`` or None if not found
         """
-        return resolve_category_for_video(video_filename, self.db, self.config)
+        clean_filename = strip_ordering_prefix(video_filename)
+        category = self._get_cached_category(clean_filename)
+        if category is not None:
+            return category
+        
+        try:
+            video = self.db.get_video_by_filename(clean_filename)
+        except Exception as e:
+            logger.warning(f"Failed to look up video {clean_filename}: {e}")
+            return None
+        return self._category_from_video_row(clean_filename, video)
+
+    async def get_category_for_video_async(self, video_filename: str) -> Optional[dict[str, str]]:
+        """
+        Like :meth:`get_category_for_video`, but runs the database lookup in
+        a worker thread so a cache miss doesn't block the event loop.
+        
+        Args:
+            video_filename: Filename of the video to look up
+            
+        Returns:
+            ``{"twitch": "...", "kick": "..."}`` or None if not found
+        """
+        clean_filename = strip_ordering_prefix(video_filename)
+        category = self._get_cached_category(clean_filename)
+        if category is not None:
+            return category
+        
+        try:
+            video = await asyncio.to_thread(self.db.get_video_by_filename, clean_filename)
+        except Exception as e:
+            logger.warning(f"Failed to look up video {clean_filename}: {e}")
+            return None
+        return self._category_from_video_row(clean_filename, video)
+
+    def _get_cached_category(self, clean_filename: str) -> Optional[dict[str, str]]:
+        """Categories for a video from the rotation index or the lookup cache, without touching the database."""
+        playlist_name = self._video_playlist_index.get(clean_filename)
+        if playlist_name is not None:
+            category = self._get_playlist_categories(playlist_name)
+            if category is not None:
+                return category
+        
+        entry = self._video_lookup_cache.get(clean_filename)
+        if entry is not None and entry[0] > time.monotonic():
+            self._video_lookup_cache.move_to_end(clean_filename)
+            return self._get_playlist_categories(entry[1])
+        return None
+
+    def _category_from_video_row(self, clean_filename: str, video: Optional[dict]) -> Optional[dict[str, str]]:
+        """Cache the playlist of a looked-up video and resolve its categories.
+        
+        Only hits are cached: a video that isn't registered yet (e.g.
+        still downloading during temp playback) is looked up again next time.
+        """
+        playlist_name = video.get('playlist_name') if video else None
+        if not playlist_name:
+            logger.debug("Video not found in database: %s", clean_filename)
+            return None
+        
+        self._video_lookup_cache[clean_filename] = (time.monotonic() + self.VIDEO_LOOKUP_CACHE_TTL, playlist_name)
+        self._video_lookup_cache.move_to_end(clean_filename)
+        while len(self._video_lookup_cache) > self.VIDEO_LOOKUP_CACHE_SIZE:
+            self._video_lookup_cache.popitem(last=False)
+        return self._get_playlist_categories(playlist_name)
+
+    def _get_playlist_categories(self, playlist_name: str) -> Optional[dict[str, str]]:
+        """Resolved categories for a configured playlist, cached until playlists.json changes."""
+        config_playlists = self.config.get_playlists()
+        if self._playlist_category_source is not config_playlists:
+            self._playlist_category_cache = {}
+            self._playlist_category_source = config_playlists
+        try:
+            return self._playlist_category_cache[playlist_name]
+        except KeyError:
+            playlist = self.config.get_playlist_by_name(playlist_name)
+            category = resolve_playlist_categories(playlist) if playlist is not None else None
+            self._playlist_category_cache[playlist_name] = category
+            return category
+
+    def prime_video_index(self, video_folder: str) -> None:
+        """
+        Map every video in the rotation folder to its playlist with one query.
+        
+        The folder's contents are fixed for the rotation, so video
+        transitions can then resolve categories from memory.  Videos not
+        in the index (e.g. temp playback) still go through the database.
+        
+        Args:
+            video_folder: Path to the live video folder
+        """
+        try:
+            filenames = [strip_ordering_prefix(f) for f in get_video_files_sorted(video_folder)]
+            self._video_playlist_index = self.db.get_playlist_names_for_videos(filenames)
+            logger.debug("Indexed %d/%d rotation videos by playlist", len(self._video_playlist_index), len(filenames))
+        except Exception as e:
+            self._video_playlist_index = {}
+            logger.warning(f"Failed to index rotation videos: {e}")
 
     async def update_category_for_video_async(self, video_filename: str, stream_manager) -> bool:
         """
@@ -69,27 +282,132 @@ class ContentSwitchHandler:
             return True
         
         try:
-            category = self.get_category_for_video(video_filename)
+            category = await self.get_category_for_video_async(video_filename)
             if not category:
                 return True
             
-            # Throttle category updates to prevent spam (only allow one per 3 seconds)
-            current_time = time.time()
-            if current_time - self._last_category_update_time >= 3:
-                # Only update category - title is managed separately at rotation/temp playback boundaries
-                await stream_manager.update_category(category)
-                
-                self._last_category_update_time = current_time
-                logger.info(f"Updated category to '{category}' (from video: {video_filename})")
-                return True
-            else:
-                logger.debug(f"Skipping category update for '{category}' - throttled (from video: {video_filename})")
+            # Throttle category updates to prevent spam (at most one per
+            # cooldown).  Inside the cooldown the newest category is kept and
+            # sent once it ends, so a burst of transitions collapses into a
+            # single update that still reflects the latest video.
+            loop = asyncio.get_running_loop()
+            remaining = self._last_category_update_time + self.CATEGORY_UPDATE_COOLDOWN - loop.time()
+            if remaining > 0:
+                self._pending_category = (category, video_filename, stream_manager)
+                if self._category_flush_handle is None:
+                    self._category_flush_handle = loop.call_later(remaining, self._start_category_flush)
+                logger.debug("Deferring category update for '%s' - throttled (from video: %s)", category, video_filename)
                 return True
+            
+            # Claim the window before awaiting so concurrent callers are
+            # throttled, and supersede any deferred (older) category whose
+            # flush hasn't run yet
+            self._last_category_update_time = loop.time()
+            self._pending_category = None
+            if self._category_flush_handle is not None:
+                self._category_flush_handle.cancel()
+                self._category_flush_handle = None
+            # Only update category - title is managed separately at rotation/temp playback boundaries
+            await stream_manager.update_category(category)
+            logger.info("Updated category to '%s' (from video: %s)", category, video_filename)
+            return True
         except Exception as e:
             logger.error(f"Failed to update category for video {video_filename}: {e}")
             return False
 
-    def get_initial_rotation_category(self, video_folder: str, playlist_manager) -> Optional[dict[str, str]]:
+    def request_category_update(self, video_filename: str, stream_manager) -> None:
+        """
+        Queue a category update for a video transition and return immediately.
+        
+        A single background consumer performs the lookup and API call, so
+        the transition callback never waits on the database or the
+        platforms.  If the queue is full the oldest request is dropped —
+        only the latest video matters.
+        
+        Args:
+            video_filename: Filename of the currently playing video
+            stream_manager: StreamManager instance for updates
+        """
+        if not video_filename:
+            return
+        if self._category_consumer_task is None or self._category_consumer_task.done():
+            self._category_queue = asyncio.Queue(maxsize=self.CATEGORY_QUEUE_SIZE)
+            self._category_consumer_task = asyncio.ensure_future(self._category_consumer())
+        assert self._category_queue is not None
+        if self._category_queue.full():
+            self._category_queue.get_nowait()
+        self._category_queue.put_nowait((video_filename, stream_manager))
+
+    async def _category_consumer(self) -> None:
+        """Drain queued video transitions, skipping consecutive repeats of the same video."""
+        assert self._category_queue is not None
+        last_filename = None
+        while True:
+            video_filename, stream_manager = await self._category_queue.get()
+            if video_filename == last_filename:
+                continue
+            last_filename = video_filename
+            await self.update_category_for_video_async(video_filename, stream_manager)
+
+    def _start_category_flush(self) -> None:
+        """Timer callback: send the category deferred during the cooldown."""
+        self._category_flush_handle = None
+        self._category_flush_task = asyncio.ensure_future(self._flush_pending_category())
+
+    async def _flush_pending_category(self) -> None:
+        """Send the most recent throttled category update, if any."""
+        pending = self._pending_category
+        self._pending_category = None
+        if pending is None:
+            return
+        category, video_filename, stream_manager = pending
+        try:
+            self._last_category_update_time = asyncio.get_running_loop().time()
+            await stream_manager.update_category(category)
+            logger.info("Updated category to '%s' (deferred, from video: %s)", category, video_filename)
+        except Exception as e:
+            logger.error(f"Failed to update category for video {video_filename}: {e}")
+
+    def cancel_category_updates(self) -> list[asyncio.Task]:
+        """Cancel the category consumer and any deferred category flush.
+
+        Does not wait; the cancelled tasks are returned so async callers
+        can await them.  Used when this handler is being replaced (e.g.
+        after an OBS reconnect) so its stale updates can't overwrite the
+        new handler's.
+
+        Returns:
+            Tasks that were cancelled and have not finished yet
+        """
+        if self._category_flush_handle is not None:
+            self._category_flush_handle.cancel()
+            self._category_flush_handle = None
+        self._pending_category = None
+        cancelled = []
+        for task in (self._category_flush_task, self._category_consumer_task):
+            if task is not None and not task.done():
+                task.cancel()
+                cancelled.append(task)
+        self._category_flush_task = None
+        self._category_consumer_task = None
+        self._category_queue = None
+        return cancelled
+
+    async def stop(self) -> None:
+        """Cancel category updates and wait for them to finish.
+
+        Called on shutdown before the platform clients are closed, so no
+        late update reaches them.
+        """
+        for task in self.cancel_category_updates():
+            try:
+                await task
+            except asyncio.CancelledError:
+                pass
+
+    def get_initial_rotation_category(self, video_folder: str,
+                                      session: Optional[dict] = None,
+                                      playlists: Optional[list] = None) -> Optional[dict[str, str]]:
         """
         Get per-platform categories for the first video in rotation, with fallback to first playlist.
         
@@ -97,7 +415,8 @@ class ContentSwitchHandler:
         
         Args:
             video_folder: Path to the video folder to scan
-            playlist_manager: PlaylistManager instance to get first playlist as fallback
+            session: Current session row if the caller already has it (avoids a DB read)
+            playlists: The session's selected playlists if the caller already resolved them
             
         Returns:
             ``{"twitch": "...", "kick": "..."}`` or None if unable to determine
@@ -106,29 +425,26 @@ class ContentSwitchHandler:
         
         try:
             # Get first video from the folder (sorted alphabetically, matching VLC order)
-            video_files = get_video_files_sorted(video_folder)
-            if video_files:
-                first_video = video_files[0]
+            first_video = get_first_video_sorted(video_folder)
+            if first_video:
                 original_name = strip_ordering_prefix(first_video)
                 category = self.get_category_for_video(original_name)
                 if category:
-                    logger.info(f"Got initial rotation category from first video: {first_video} -> {category}")
+                    logger.info("Got initial rotation category from first video: %s -> %s", first_video, category)
                     return category
         except Exception as e:
             logger.warning(f"Failed to get category from first video: {e}")
         
         # Fallback: get category from first selected playlist in current session
         try:
-            session = self.db.get_current_session()
-            if session:
-                playlists_selected = session.get('playlists_selected', '')
-                if playlists_selected:
-                    playlist_ids = json.loads(playlists_selected)
-                    playlists = playlist_manager.get_playlists_by_ids(playlist_ids)
-                    if playlists:
-                        category = resolve_playlist_categories(playlists[0])
-                        logger.info(f"Using fallback category from first selected playlist: {category}")
-                        return category
+            if playlists is None:
+                if session is None:
+                    session = self.db.get_current_session()
+                playlists = self.get_session_playlists(session) if session else []
+            if playlists:
+                category = resolve_playlist_categories(playlists[0])
+                logger.info("Using fallback category from first selected playlist: %s", category)
+                return category
         except Exception as e:
             logger.warning(f"Failed to get fallback category from playlist: {e}")
         
@@ -147,36 +463,7 @@ class ContentSwitchHandler:
         Returns:
             Truncated title that fits within MAX_TITLE_LENGTH
         """
-        if len(title) <= self.MAX_TITLE_LENGTH:
-            return title
-        
-        # Title is too long, need to truncate by removing playlists from the end
-        # Format is typically: "TEMPLATE | PLAYLIST1 | PLAYLIST2 | ..."
-        
-        # Split on " | " to separate template and playlists
-        parts = title.split(' | ')
-        if len(parts) < 2:
-            # Can't parse, just truncate to limit
-            logger.warning(f"Could not parse title for truncation: {title[:50]}...")
-            return title[:self.MAX_TITLE_LENGTH]
-        
-        template = parts[0]  # Keep the template part
-        playlists = parts[1:]  # These are the playlist names
-        
-        # Start with just the template
-        result = template
-        
-        # Add playlists back one by one until it exceeds the limit
-        for playlist in playlists:
-            candidate = f"{result} | {playlist}"
-            if len(candidate) <= self.MAX_TITLE_LENGTH:
-                result = candidate
-            else:
-                # This playlist would make it too long, stop
-                break
-        
-        logger.info(f"Truncated title from {len(title)} to {len(result)} chars: {result}")
-        return result
+        return _truncate_title(title, self.MAX_TITLE_LENGTH)
     
     async def prepare_for_switch(self, scene_rotation_screen: str, vlc_source_name: str) -> bool:
         """
@@ -195,9 +482,27 @@ class ContentSwitchHandler:
         if not self.obs_controller.stop_vlc_source(vlc_source_name):
             logger.error(f"Failed to stop VLC source: {vlc_source_name}")
             return False
-        await asyncio.sleep(3)  # Wait for VLC to release file handles
+        await self._wait_for_vlc_release(vlc_source_name)
         return True
 
+    async def _wait_for_vlc_release(self, vlc_source_name: str) -> None:
+        """Wait until VLC reports it has stopped, up to VLC_RELEASE_TIMEOUT.
+
+        Replaces a fixed 3 second sleep: VLC usually drops its file
+        handles well before that.  At least VLC_RELEASE_MIN_WAIT is always
+        waited, since a source whose last video ENDED already reads as
+        released on the first poll.  If the state can't be read the full
+        timeout is still waited out, matching the old behaviour.
+        """
+        loop = asyncio.get_running_loop()
+        start = loop.time()
+        if await self.obs_controller.wait_for_vlc_stopped(
+            vlc_source_name, timeout=self.VLC_RELEASE_TIMEOUT, min_wait=self.VLC_RELEASE_MIN_WAIT
+        ):
+            logger.debug("VLC released files after %.2fs", loop.time() - start)
+        else:
+            logger.debug("VLC did not report a stopped state within %ss — continuing", self.VLC_RELEASE_TIMEOUT)
+
     def execute_switch(self, current_folder: str, next_folder: str) -> bool:
         """
         Execute the actual folder content switch.
@@ -211,6 +516,8 @@ class ContentSwitchHandler:
         """
         # Normal rotation: wipe and switch
         success = self.playlist_manager.switch_content_folders(current_folder, next_folder)
+        # The live folder's contents changed — drop cached video lookups
+        self._video_lookup_cache.clear()
         
         if not success:
             logger.error("Failed to switch content folders")
@@ -249,13 +556,15 @@ class ContentSwitchHandler:
         
         return True, playlist
 
-    async def update_stream_metadata(self, session_id: Optional[int], stream_manager) -> bool:
+    async def update_stream_metadata(self, session_id: Optional[int], stream_manager,
+                                     session: Optional[dict] = None) -> bool:
         """
         Update stream title and category based on session.
         
         Args:
             session_id: Current session ID
             stream_manager: StreamManager instance for updates
+            session: Current session row if the caller already has it (avoids a DB read)
             
         Returns:
             True if successful (or if no session)
@@ -263,7 +572,8 @@ class ContentSwitchHandler:
         if not session_id:
             return True
         
-        session = self.db.get_current_session()
+        if session is None:
+            session = self.db.get_current_session()
         if not session:
             return True
         
@@ -274,20 +584,17 @@ class ContentSwitchHandler:
         
         # Get category from selected playlists
         category = None
-        playlists_selected = session.get('playlists_selected', '')
-        if playlists_selected:
-            try:
-                playlist_ids = json.loads(playlists_selected)
-                playlists = self.playlist_manager.get_playlists_by_ids(playlist_ids)
-                if playlists and len(playlists) > 0:
-                    category = playlists[0].get('category') or playlists[0].get('name')
-            except (json.JSONDecodeError, ValueError) as e:
-                logger.warning(f"Could not parse playlists_selected: {e}")
+        try:
+            playlists = self.get_session_playlists(session)
+            if playlists:
+                category = playlists[0].get('category') or playlists[0].get('name')
+        except ValueError as e:
+            logger.warning(f"Could not parse playlists_selected: {e}")
         
         # Update via stream manager
         try:
             await stream_manager.update_both(stream_title, category)
-            logger.info(f"Updated stream: title='{stream_title}', category='{category}'")
+            logger.info("Updated stream: title='%s', category='%s'", stream_title, category)
             return True
         except Exception as e:
             logger.error(f"Failed to update stream info: {e}")
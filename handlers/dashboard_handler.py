@@ -9,12 +9,15 @@ import json
 import logging
 import os
 import time
-from typing import Optional, TYPE_CHECKING
+from typing import Awaitable, Callable, Optional, TYPE_CHECKING
 
-from dotenv import set_key
+from dotenv import dotenv_values, set_key
 from config.constants import (
+    _PROJECT_ROOT,
     DEFAULT_VIDEO_FOLDER,
 )
+from utils import json_utils
+from utils.video_utils import resolve_playlist_categories
 
 if TYPE_CHECKING:
     from controllers.automation_controller import AutomationController
@@ -33,6 +36,40 @@ class DashboardHandler:
     def __init__(self, ctrl: 'AutomationController') -> None:
         self.ctrl = ctrl
         self._skip_ready: bool = True
+        # Result of _build_env_config(); env only changes through reload_env()
+        self._env_config: Optional[dict] = None
+        # Lowercased playlist name -> position, for the last _load_playlists_raw() result
+        self._name_idx: dict[str, int] = {}
+        # Dashboard action -> handler coroutine
+        self._commands: dict[str, Callable[[dict], Awaitable[None]]] = {
+            "skip_video": self._cmd_skip_video,
+            "trigger_rotation": self._cmd_trigger_rotation,
+            "update_setting": self._cmd_update_setting,
+            "add_playlist": self._cmd_add_playlist,
+            "update_playlist": self._cmd_update_playlist,
+            "remove_playlist": self._cmd_remove_playlist,
+            "rename_playlist": self._cmd_rename_playlist,
+            "toggle_playlist": self._cmd_toggle_playlist,
+            "pause_stream": self._cmd_pause_stream,
+            "resume_stream": self._cmd_resume_stream,
+            "create_prepared_rotation": self._cmd_create_prepared_rotation,
+            "download_prepared_rotation": self._cmd_download_prepared_rotation,
+            "cancel_prepared_download": self._cmd_cancel_prepared_download,
+            "execute_prepared_rotation": self._cmd_execute_prepared_rotation,
+            "delete_prepared_rotation": self._cmd_delete_prepared_rotation,
+            "clear_completed_prepared": self._cmd_clear_completed_prepared,
+            "schedule_prepared_rotation": self._cmd_schedule_prepared_rotation,
+            "cancel_prepared_schedule": self._cmd_cancel_prepared_schedule,
+            "toggle_prepared_fallback": self._cmd_toggle_prepared_fallback,
+            "force_fallback": self._cmd_force_fallback,
+            "deactivate_fallback": self._cmd_deactivate_fallback,
+            "reload_env": self._cmd_reload_env,
+            "update_env": self._cmd_update_env,
+        }
+        # Strong references to fire-and-forget tasks (the loop only keeps weak ones)
+        self._background_tasks: set[asyncio.Task] = set()
+        # Pending follow-up push from _push_state_after_command (at most one)
+        self._delayed_push_task: Optional[asyncio.Task] = None
 
     # ── Convenience shortcuts ─────────────────────────────────────
 
@@ -58,74 +95,79 @@ class DashboardHandler:
         """Push an immediate state snapshot and schedule a delayed follow-up.
 
         Called after skip/rotate commands so the dashboard reflects
-        changes without waiting for the next periodic push cycle.
+        changes without waiting for the next periodic push cycle.  A burst
+        of commands shares one follow-up: each new command restarts it.
         """
-        if self.ctrl.web_dashboard:
+        # Nothing to push (and no snapshot to build) while the client is offline
+        if self.ctrl.web_dashboard and self.ctrl.web_dashboard.connected:
             await self.ctrl.web_dashboard.push_state_now()
-            asyncio.create_task(self.ctrl.web_dashboard.push_state_delayed(delay))
+            if self._delayed_push_task is not None and not self._delayed_push_task.done():
+                self._delayed_push_task.cancel()
+            task = asyncio.create_task(self.ctrl.web_dashboard.push_state_delayed(delay))
+            self._delayed_push_task = task
+            self._background_tasks.add(task)
+            task.add_done_callback(self._on_background_task_done)
+
+    def _on_background_task_done(self, task: asyncio.Task) -> None:
+        """Drop a finished background task and log its failure, if any."""
+        self._background_tasks.discard(task)
+        if not task.cancelled() and task.exception() is not None:
+            logger.error(f"Background dashboard task failed: {task.exception()}")
 
     # ── State snapshot ────────────────────────────────────────────
 
-    def get_dashboard_state(self) -> dict:
-        """Build a state snapshot for the web dashboard.
+    async def get_dashboard_state_async(self) -> dict:
+        """Return a state snapshot for the web dashboard.
 
-        Includes core status fields plus extended data for playlists,
-        settings, queue, and platform connections pages.
+        The snapshot's blocking reads (database, config files, folder
+        listings, prepared rotation metadata) run concurrently in worker
+        threads instead of on the event loop.
         """
-        ctrl = self.ctrl
-
-        status = "offline"
-        if ctrl.last_stream_status == "live":
-            status = "paused"
-        elif ctrl.obs_controller and ctrl.obs_controller.is_connected:
-            status = "online"
-
-        current_video: Optional[str] = None
-        current_playlist: Optional[str] = None
-        current_category: Optional[dict] = None
+        (current_playlist, playlists, settings, queue,
+         current_category, prepared_state) = await asyncio.gather(
+            asyncio.to_thread(self._fetch_current_playlist),
+            asyncio.to_thread(self._fetch_playlists),
+            asyncio.to_thread(self._fetch_settings),
+            asyncio.to_thread(self._fetch_queue),
+            asyncio.to_thread(self._fetch_current_category),
+            asyncio.to_thread(self.ctrl.prepared_rotation_manager.get_dashboard_state),
+        )
+        return self._build_dashboard_state(
+            current_playlist, playlists, settings, queue, current_category, prepared_state,
+        )
 
-        if ctrl.playback_monitor:
-            current_video = ctrl.playback_monitor.current_video_original_name
+    # Blocking reads for the snapshot.  They only touch the database and
+    # the filesystem, so get_dashboard_state_async() runs them in threads.
 
+    def _fetch_current_playlist(self) -> Optional[str]:
+        """Comma-separated names of the current session's selected playlists."""
+        ctrl = self.ctrl
         session = ctrl.db.get_current_session()
         if session:
             playlists_json = session.get('playlists_selected')
             if playlists_json:
                 try:
-                    playlist_ids = json.loads(playlists_json) if isinstance(playlists_json, str) else playlists_json
-                    names = []
-                    for pid in playlist_ids:
-                        p = ctrl.db.get_playlist(pid)
-                        if p:
-                            names.append(p['name'])
-                    current_playlist = ", ".join(names) if names else None
+                    playlist_ids = json_utils.loads(playlists_json) if isinstance(playlists_json, str) else playlists_json
+                    # One IN query for all selected playlists, in selection order
+                    names = [p['name'] for p in ctrl.db.get_playlists_by_ids(playlist_ids)]
+                    return ", ".join(names) if names else None
                 except Exception:
                     pass
+        return None
 
-        if ctrl.playback_monitor:
-            current_category = ctrl.playback_monitor.get_category_for_current_video()
-
-        # ── Extended data ──
+    def _fetch_playlists(self) -> list[dict]:
+        """Playlists from config merged with their DB play stats (empty on error)."""
+        try:
+            # Also covers disabled ones so the dashboard shows stats for every playlist
+            db_stats = self.ctrl.db.get_playlist_stats()
+        except Exception:
+            db_stats = {}
 
         # Playlists from config (name, url, twitch_category, kick_category, enabled, priority)
         # Merge in last_played / play_count from the database.
         playlists = []
         try:
-            # Build a lookup of DB stats keyed by playlist name
-            db_stats: dict[str, dict] = {}
-            try:
-                # Also grab disabled ones so the dashboard shows stats for every playlist
-                with ctrl.db._cursor() as _cur:
-                    _cur.execute("SELECT name, last_played, play_count FROM playlists")
-                    for row in _cur.fetchall():
-                        db_stats[row["name"]] = {
-                            "last_played": row["last_played"],
-                            "play_count": row["play_count"] or 0,
-                        }
-            except Exception:
-                pass
-
-            for p in ctrl.config_manager.get_playlists():
+            for p in self.ctrl.config_manager.get_playlists():
                 name = p.get("name", "")
                 stats = db_stats.get(name, {})
                 playlists.append({
@@ -140,45 +182,65 @@ class DashboardHandler:
                 })
         except Exception:
             pass
+        return playlists
 
-        # Settings (all hot-swappable keys from settings.json)
-        settings: dict = {}
+    def _fetch_settings(self) -> dict:
+        """Dashboard-relevant keys from settings.json (empty on error)."""
         try:
-            raw = ctrl.config_manager.get_settings()
+            raw = self.ctrl.config_manager.get_settings()
             # Only expose dashboard-relevant keys (exclude folder paths)
-            for key in (
-                "stream_title_template",
-                "ignore_streamer",
-                "notify_video_transitions",
-                "min_playlists_per_rotation",
-                "max_playlists_per_rotation",
-                "download_retry_attempts",
-                "yt_dlp_use_cookies",
-                "yt_dlp_browser_for_cookies",
-                "yt_dlp_verbose",
-            ):
-                if key in raw:
-                    settings[key] = raw[key]
+            return {key: raw[key] for key in self._SETTING_KEYS & raw.keys()}
         except Exception:
-            pass
+            return {}
 
-        # Video queue (files in the current rotation folder)
-        queue: list[str] = []
+    def _fetch_queue(self) -> list[str]:
+        """Video files in the current rotation folder (empty on error)."""
+        playback_monitor = self.ctrl.playback_monitor
         try:
-            if ctrl.playback_monitor and ctrl.playback_monitor.video_folder:
-                queue = ctrl.playback_monitor._get_video_files()
+            if playback_monitor and playback_monitor.video_folder:
+                return playback_monitor.get_video_files_cached()
         except Exception:
             pass
+        return []
+
+    def _fetch_current_category(self) -> Optional[dict]:
+        """Per-platform categories for the current video (may hit the DB)."""
+        playback_monitor = self.ctrl.playback_monitor
+        if playback_monitor:
+            return playback_monitor.get_category_for_current_video()
+        return None
+
+    def _build_dashboard_state(self, current_playlist: Optional[str], playlists: list[dict],
+                               settings: dict, queue: list[str], current_category: Optional[dict],
+                               prepared_state: dict) -> dict:
+        """Build a state snapshot for the web dashboard from prefetched reads.
+
+        Includes core status fields plus extended data for playlists,
+        settings, queue, and platform connections pages.  Everything read
+        here is in-memory controller state.
+        """
+        ctrl = self.ctrl
+
+        # Read once so status, connections and obs_connected always agree
+        obs_connected = bool(ctrl.obs_controller and ctrl.obs_controller.is_connected)
+
+        status = "offline"
+        if ctrl.last_stream_status == "live":
+            status = "paused"
+        elif obs_connected:
+            status = "online"
+
+        current_video = ctrl.playback_monitor.current_video_original_name if ctrl.playback_monitor else None
 
         # Platform connections
         connections: dict = {}
         try:
-            connections["obs"] = bool(ctrl.obs_controller and ctrl.obs_controller.is_connected)
+            connections["obs"] = obs_connected
             connections["twitch"] = bool(ctrl._env_twitch_client_id and ctrl._env_twitch_client_secret)
             connections["kick"] = bool(ctrl._env_kick_client_id and ctrl._env_kick_client_secret)
             connections["discord_webhook"] = bool(ctrl._env_discord_webhook_url)
-            connections["twitch_enabled"] = bool(os.getenv("ENABLE_TWITCH", "").lower() == "true")
-            connections["kick_enabled"] = bool(os.getenv("ENABLE_KICK", "").lower() == "true")
+            connections["twitch_enabled"] = ctrl._env_twitch_enabled
+            connections["kick_enabled"] = ctrl._env_kick_enabled
         except Exception:
             pass
 
@@ -186,18 +248,16 @@ class DashboardHandler:
         download_active = ctrl.download_manager.background_download_in_progress if ctrl.download_manager else False
 
         # Guard flags — determine whether skip/rotation are safe right now
-        videos_remaining = len(queue) - (queue.index(ctrl.playback_monitor._current_video) + 1) if (
-            ctrl.playback_monitor and ctrl.playback_monitor._current_video in queue
-        ) else 0
+        current_idx = ctrl.playback_monitor.index_of_video(queue, ctrl.playback_monitor._current_video) if (
+            ctrl.playback_monitor
+        ) else -1
+        videos_remaining = len(queue) - (current_idx + 1) if current_idx >= 0 else 0
         can_skip = self._skip_ready and (
             videos_remaining > 0 or (not download_active and ctrl.next_prepared_playlists is not None) or ctrl._fallback_active
         )
         # Disallow trigger-rotation during a prepared rotation overlay
         can_trigger_rotation = not download_active and not ctrl.is_rotating and not ctrl._prepared_rotation_active
 
-        # Prepared rotations state
-        prepared_state = ctrl.prepared_rotation_manager.get_dashboard_state()
-
         # Environment configuration (for owner settings page)
         env_config = self._build_env_config()
 
@@ -207,7 +267,7 @@ class DashboardHandler:
             "current_video": current_video,
             "current_playlist": current_playlist,
             "current_category": current_category,
-            "obs_connected": bool(ctrl.obs_controller and ctrl.obs_controller.is_connected),
+            "obs_connected": obs_connected,
             "uptime_seconds": int(time.time() - ctrl._start_time),
             "playlists": playlists,
             "settings": settings,
@@ -227,264 +287,297 @@ class DashboardHandler:
 
     async def handle_command(self, command: dict) -> None:
         """Handle a command received from the web dashboard."""
-        ctrl = self.ctrl
         action = command.get("action", "")
         payload = command.get("payload", {})
+        handler = self._commands.get(action)
+        if handler is None:
+            logger.warning(f"Unknown dashboard command: {action}")
+            return
+        await handler(payload)
 
-        if action == "skip_video":
-            # Cooldown: reject if a previous skip hasn't been processed yet
-            if not self._skip_ready:
-                logger.warning("Dashboard command: skip video REJECTED — previous skip still processing")
-                return
+    # ── Command handlers (one per dashboard action) ───────────────
 
-            # Guard: only allow skip if there are more videos in the queue
-            if ctrl.playback_monitor:
-                queue = ctrl.playback_monitor._get_video_files()
-                current = ctrl.playback_monitor._current_video
-                idx = queue.index(current) if current and current in queue else -1
-                videos_after = len(queue) - (idx + 1) if idx >= 0 else 0
-                if videos_after <= 0 and ctrl.download_manager.background_download_in_progress:
-                    logger.warning("Dashboard command: skip video REJECTED — last video and next rotation still downloading")
-                    return
-                if videos_after <= 0:
-                    # Last video — VLC would just loop. Mark consumed so the
-                    # main loop triggers rotation or prepared-rotation restore.
-                    logger.info("Dashboard command: skip video — last video, marking all content consumed")
-                    ctrl.playback_monitor._all_content_consumed = True
-                    await self._push_state_after_command()
-                    return
-            logger.info("Dashboard command: skip video")
-            self._skip_ready = False
-            if ctrl.obs_controller:
-                try:
-                    # Disarm any active suppression window so the skip
-                    # event is counted as a real transition.
-                    if ctrl.playback_monitor:
-                        ctrl.playback_monitor.disarm_suppress()
-                    ctrl.obs_controller.obs_client.trigger_media_input_action(
-                        name=self._vlc_source_name,
-                        action="OBS_WEBSOCKET_MEDIA_INPUT_ACTION_NEXT",
-                    )
-                except Exception as e:
-                    logger.warning(f"Failed to skip video via dashboard: {e}")
-                    self._skip_ready = True  # Re-enable on failure
-            await self._push_state_after_command()
-
-        elif action == "trigger_rotation":
-            # Guard: only allow if not already rotating and no download in progress
-            if ctrl.download_manager.background_download_in_progress:
-                logger.warning("Dashboard command: trigger rotation REJECTED — next rotation still downloading")
-                return
-            if ctrl.is_rotating:
-                logger.warning("Dashboard command: trigger rotation REJECTED — rotation already in progress")
+    async def _cmd_skip_video(self, payload: dict) -> None:
+        ctrl = self.ctrl
+        # Cooldown: reject if a previous skip hasn't been processed yet
+        if not self._skip_ready:
+            logger.warning("Dashboard command: skip video REJECTED — previous skip still processing")
+            return
+
+        # Guard: only allow skip if there are more videos in the queue
+        if ctrl.playback_monitor:
+            queue = ctrl.playback_monitor.get_video_files_cached()
+            current = ctrl.playback_monitor._current_video
+            idx = ctrl.playback_monitor.index_of_video(queue, current)
+            videos_after = len(queue) - (idx + 1) if idx >= 0 else 0
+            if videos_after <= 0 and ctrl.download_manager.background_download_in_progress:
+                logger.warning("Dashboard command: skip video REJECTED — last video and next rotation still downloading")
                 return
-            logger.info("Dashboard command: trigger rotation")
-            # Force all-content-consumed so rotation triggers on next tick
-            if ctrl.playback_monitor:
+            if videos_after <= 0:
+                # Last video — VLC would just loop. Mark consumed so the
+                # main loop triggers rotation or prepared-rotation restore.
+                logger.info("Dashboard command: skip video — last video, marking all content consumed")
                 ctrl.playback_monitor._all_content_consumed = True
-            await self._push_state_after_command()
-
-        elif action == "update_setting":
-            key = payload.get("key")
-            value = payload.get("value")
-            if key:
-                logger.info(f"Dashboard command: update setting {key}={value}")
-                self._apply_setting(key, value)
-
-        elif action == "add_playlist":
-            logger.info(f"Dashboard command: add playlist {payload.get('name')}")
-            self._playlist_add(payload)
-
-        elif action == "update_playlist":
-            logger.info(f"Dashboard command: update playlist {payload.get('name')}")
-            self._playlist_update(payload)
-
-        elif action == "remove_playlist":
-            logger.info(f"Dashboard command: remove playlist {payload.get('name')}")
-            self._playlist_remove(payload.get("name", ""))
-
-        elif action == "rename_playlist":
-            old_name = payload.get("old_name", "")
-            new_name = payload.get("new_name", "")
-            logger.info(f"Dashboard command: rename playlist '{old_name}' -> '{new_name}'")
-            self._playlist_rename(old_name, new_name)
-
-        elif action == "toggle_playlist":
-            name = payload.get("name", "")
-            enabled = payload.get("enabled")
-            logger.info(f"Dashboard command: toggle playlist {name} -> {enabled}")
-            self._playlist_toggle(name, enabled)
-
-        elif action == "pause_stream":
-            logger.info("Dashboard command: pause stream")
-            self.manual_pause_stream()
-
-        elif action == "resume_stream":
-            logger.info("Dashboard command: resume stream")
-            self.manual_resume_stream()
-
-        # ── Prepared rotation commands ──
-
-        elif action == "create_prepared_rotation":
-            title = payload.get("title", "Untitled")
-            playlists = payload.get("playlists", [])
-            logger.info(f"Dashboard command: create prepared rotation '{title}' with {playlists}")
-            ctrl.prepared_rotation_manager.create(title, playlists)
-
-        elif action == "download_prepared_rotation":
-            slug = payload.get("slug", "")
-            folder = ctrl.prepared_rotation_manager.resolve_folder(slug)
-            if not folder:
-                logger.warning(f"download_prepared_rotation: invalid slug {slug!r}")
-                return
-            logger.info(f"Dashboard command: download prepared rotation '{slug}'")
-            if not ctrl.prepared_rotation_manager.start_download(folder):
-                logger.warning("download_prepared_rotation failed — check status or another download in progress")
-
-        elif action == "cancel_prepared_download":
-            slug = payload.get("slug", "")
-            folder = ctrl.prepared_rotation_manager.resolve_folder(slug)
-            if not folder:
-                logger.warning(f"cancel_prepared_download: invalid slug {slug!r}")
-                return
-            logger.info(f"Dashboard command: cancel prepared download '{slug}'")
-            ctrl.prepared_rotation_manager.cancel_download(folder)
-
-        elif action == "execute_prepared_rotation":
-            slug = payload.get("slug", "")
-            folder = ctrl.prepared_rotation_manager.resolve_folder(slug)
-            if not folder:
-                logger.warning(f"execute_prepared_rotation: invalid slug {slug!r}")
-                return
-            restore_cursor = bool(payload.get("restore_cursor", False))
-            logger.info(f"Dashboard command: execute prepared rotation '{slug}' (restore_cursor={restore_cursor})")
-            await self.execute_prepared_rotation(folder, restore_cursor=restore_cursor)
-
-        elif action == "delete_prepared_rotation":
-            slug = payload.get("slug", "")
-            folder = ctrl.prepared_rotation_manager.resolve_folder(slug)
-            if not folder:
-                logger.warning(f"delete_prepared_rotation: invalid slug {slug!r}")
+                await self._push_state_after_command()
                 return
-            logger.info(f"Dashboard command: delete prepared rotation '{slug}'")
-            ctrl.prepared_rotation_manager.delete(folder)
-
-        elif action == "clear_completed_prepared":
-            logger.info("Dashboard command: clear completed prepared rotations")
-            count = ctrl.prepared_rotation_manager.clear_completed()
-            logger.info(f"Cleared {count} completed prepared rotations")
-
-        elif action == "schedule_prepared_rotation":
-            slug = payload.get("slug", "")
-            folder = ctrl.prepared_rotation_manager.resolve_folder(slug)
-            if not folder:
-                logger.warning(f"schedule_prepared_rotation: invalid slug {slug!r}")
-                return
-            scheduled_at = payload.get("scheduled_at", "")
-            logger.info(f"Dashboard command: schedule prepared rotation '{slug}' for {scheduled_at}")
-            ctrl.prepared_rotation_manager.schedule(folder, scheduled_at)
-
-        elif action == "cancel_prepared_schedule":
-            slug = payload.get("slug", "")
-            folder = ctrl.prepared_rotation_manager.resolve_folder(slug)
-            if not folder:
-                logger.warning(f"cancel_prepared_schedule: invalid slug {slug!r}")
-                return
-            logger.info(f"Dashboard command: cancel schedule for '{slug}'")
-            ctrl.prepared_rotation_manager.cancel_schedule(folder)
-
-        elif action == "toggle_prepared_fallback":
-            slug = payload.get("slug", "")
-            folder = ctrl.prepared_rotation_manager.resolve_folder(slug)
-            if not folder:
-                logger.warning(f"toggle_prepared_fallback: invalid slug {slug!r}")
-                return
-            value = bool(payload.get("is_fallback", False))
-            logger.info(f"Dashboard command: toggle fallback for '{slug}' -> {value}")
-            ctrl.prepared_rotation_manager.set_fallback(folder, value)
-
-        elif action == "force_fallback":
-            logger.warning("Dashboard command: FORCE ACTIVATE fallback mode (testing)")
-            await ctrl._activate_fallback()
-
-        elif action == "deactivate_fallback":
-            logger.info("Dashboard command: manually deactivate fallback mode")
-            await ctrl._deactivate_fallback()
-
-        elif action == "reload_env":
-            logger.info("Dashboard command: reload .env configuration")
-            changed = ctrl.reload_env()
-            if changed:
-                safe = {k: ("****" if "SECRET" in k or "PASSWORD" in k or "API_KEY" in k else v) for k, v in changed.items()}
-                logger.info(f"Environment reloaded — changed: {', '.join(safe.keys())}")
-            else:
-                logger.info("Environment reloaded — no changes")
-
-        elif action == "update_env":
-            key = payload.get("key", "")
-            value = payload.get("value", "")
-            if not key:
-                logger.warning("update_env: missing key")
-                return
-            self._apply_env_var(key, str(value))
+        logger.info("Dashboard command: skip video")
+        self._skip_ready = False
+        if ctrl.obs_controller:
+            try:
+                # Disarm any active suppression window so the skip
+                # event is counted as a real transition.
+                if ctrl.playback_monitor:
+                    ctrl.playback_monitor.disarm_suppress()
+                ctrl.obs_controller.obs_client.trigger_media_input_action(
+                    name=self._vlc_source_name,
+                    action="OBS_WEBSOCKET_MEDIA_INPUT_ACTION_NEXT",
+                )
+            except Exception as e:
+                logger.warning(f"Failed to skip video via dashboard: {e}")
+                self._skip_ready = True  # Re-enable on failure
+        await self._push_state_after_command()
+
+    async def _cmd_trigger_rotation(self, payload: dict) -> None:
+        ctrl = self.ctrl
+        # Guard: only allow if not already rotating and no download in progress
+        if ctrl.download_manager.background_download_in_progress:
+            logger.warning("Dashboard command: trigger rotation REJECTED — next rotation still downloading")
+            return
+        if ctrl.is_rotating:
+            logger.warning("Dashboard command: trigger rotation REJECTED — rotation already in progress")
+            return
+        logger.info("Dashboard command: trigger rotation")
+        # Force all-content-consumed so rotation triggers on next tick
+        if ctrl.playback_monitor:
+            ctrl.playback_monitor._all_content_consumed = True
+        await self._push_state_after_command()
+
+    async def _cmd_update_setting(self, payload: dict) -> None:
+        key = payload.get("key")
+        value = payload.get("value")
+        if key:
+            logger.info(f"Dashboard command: update setting {key}={value}")
+            await self._apply_setting(key, value)
+
+    async def _cmd_add_playlist(self, payload: dict) -> None:
+        logger.info(f"Dashboard command: add playlist {payload.get('name')}")
+        self._playlist_add(payload)
+
+    async def _cmd_update_playlist(self, payload: dict) -> None:
+        logger.info(f"Dashboard command: update playlist {payload.get('name')}")
+        self._playlist_update(payload)
+
+    async def _cmd_remove_playlist(self, payload: dict) -> None:
+        logger.info(f"Dashboard command: remove playlist {payload.get('name')}")
+        self._playlist_remove(payload.get("name", ""))
+
+    async def _cmd_rename_playlist(self, payload: dict) -> None:
+        old_name = payload.get("old_name", "")
+        new_name = payload.get("new_name", "")
+        logger.info(f"Dashboard command: rename playlist '{old_name}' -> '{new_name}'")
+        self._playlist_rename(old_name, new_name)
+
+    async def _cmd_toggle_playlist(self, payload: dict) -> None:
+        name = payload.get("name", "")
+        enabled = payload.get("enabled")
+        logger.info(f"Dashboard command: toggle playlist {name} -> {enabled}")
+        self._playlist_toggle(name, enabled)
+
+    async def _cmd_pause_stream(self, payload: dict) -> None:
+        logger.info("Dashboard command: pause stream")
+        self.manual_pause_stream()
+
+    async def _cmd_resume_stream(self, payload: dict) -> None:
+        logger.info("Dashboard command: resume stream")
+        self.manual_resume_stream()
+
+    # ── Prepared rotation commands ──
+
+    async def _cmd_create_prepared_rotation(self, payload: dict) -> None:
+        title = payload.get("title", "Untitled")
+        playlists = payload.get("playlists", [])
+        logger.info(f"Dashboard command: create prepared rotation '{title}' with {playlists}")
+        self.ctrl.prepared_rotation_manager.create(title, playlists)
+
+    async def _cmd_download_prepared_rotation(self, payload: dict) -> None:
+        ctrl = self.ctrl
+        slug = payload.get("slug", "")
+        folder = ctrl.prepared_rotation_manager.resolve_folder(slug)
+        if not folder:
+            logger.warning(f"download_prepared_rotation: invalid slug {slug!r}")
+            return
+        logger.info(f"Dashboard command: download prepared rotation '{slug}'")
+        if not ctrl.prepared_rotation_manager.start_download(folder):
+            logger.warning("download_prepared_rotation failed — check status or another download in progress")
 
+    async def _cmd_cancel_prepared_download(self, payload: dict) -> None:
+        ctrl = self.ctrl
+        slug = payload.get("slug", "")
+        folder = ctrl.prepared_rotation_manager.resolve_folder(slug)
+        if not folder:
+            logger.warning(f"cancel_prepared_download: invalid slug {slug!r}")
+            return
+        logger.info(f"Dashboard command: cancel prepared download '{slug}'")
+        ctrl.prepared_rotation_manager.cancel_download(folder)
+
+    async def _cmd_execute_prepared_rotation(self, payload: dict) -> None:
+        ctrl = self.ctrl
+        slug = payload.get("slug", "")
+        folder = ctrl.prepared_rotation_manager.resolve_folder(slug)
+        if not folder:
+            logger.warning(f"execute_prepared_rotation: invalid slug {slug!r}")
+            return
+        restore_cursor = bool(payload.get("restore_cursor", False))
+        logger.info(f"Dashboard command: execute prepared rotation '{slug}' (restore_cursor={restore_cursor})")
+        await self.execute_prepared_rotation(folder, restore_cursor=restore_cursor)
+
+    async def _cmd_delete_prepared_rotation(self, payload: dict) -> None:
+        ctrl = self.ctrl
+        slug = payload.get("slug", "")
+        folder = ctrl.prepared_rotation_manager.resolve_folder(slug)
+        if not folder:
+            logger.warning(f"delete_prepared_rotation: invalid slug {slug!r}")
+            return
+        logger.info(f"Dashboard command: delete prepared rotation '{slug}'")
+        ctrl.prepared_rotation_manager.delete(folder)
+
+    async def _cmd_clear_completed_prepared(self, payload: dict) -> None:
+        ctrl = self.ctrl
+        logger.info("Dashboard command: clear completed prepared rotations")
+        count = ctrl.prepared_rotation_manager.clear_completed()
+        logger.info(f"Cleared {count} completed prepared rotations")
+
+    async def _cmd_schedule_prepared_rotation(self, payload: dict) -> None:
+        ctrl = self.ctrl
+        slug = payload.get("slug", "")
+        folder = ctrl.prepared_rotation_manager.resolve_folder(slug)
+        if not folder:
+            logger.warning(f"schedule_prepared_rotation: invalid slug {slug!r}")
+            return
+        scheduled_at = payload.get("scheduled_at", "")
+        logger.info(f"Dashboard command: schedule prepared rotation '{slug}' for {scheduled_at}")
+        ctrl.prepared_rotation_manager.schedule(folder, scheduled_at)
+
+    async def _cmd_cancel_prepared_schedule(self, payload: dict) -> None:
+        ctrl = self.ctrl
+        slug = payload.get("slug", "")
+        folder = ctrl.prepared_rotation_manager.resolve_folder(slug)
+        if not folder:
+            logger.warning(f"cancel_prepared_schedule: invalid slug {slug!r}")
+            return
+        logger.info(f"Dashboard command: cancel schedule for '{slug}'")
+        ctrl.prepared_rotation_manager.cancel_schedule(folder)
+
+    async def _cmd_toggle_prepared_fallback(self, payload: dict) -> None:
+        ctrl = self.ctrl
+        slug = payload.get("slug", "")
+        folder = ctrl.prepared_rotation_manager.resolve_folder(slug)
+        if not folder:
+            logger.warning(f"toggle_prepared_fallback: invalid slug {slug!r}")
+            return
+        value = bool(payload.get("is_fallback", False))
+        logger.info(f"Dashboard command: toggle fallback for '{slug}' -> {value}")
+        ctrl.prepared_rotation_manager.set_fallback(folder, value)
+
+    async def _cmd_force_fallback(self, payload: dict) -> None:
+        logger.warning("Dashboard command: FORCE ACTIVATE fallback mode (testing)")
+        await self.ctrl._activate_fallback()
+
+    async def _cmd_deactivate_fallback(self, payload: dict) -> None:
+        logger.info("Dashboard command: manually deactivate fallback mode")
+        await self.ctrl._deactivate_fallback()
+
+    async def _cmd_reload_env(self, payload: dict) -> None:
+        logger.info("Dashboard command: reload .env configuration")
+        changed = self._reload_env()
+        if changed:
+            # Only key names are logged, so secret values never reach the log
+            logger.info(f"Environment reloaded — changed: {', '.join(changed)}")
         else:
-            logger.warning(f"Unknown dashboard command: {action}")
+            logger.info("Environment reloaded — no changes")
+
+    async def _cmd_update_env(self, payload: dict) -> None:
+        key = payload.get("key", "")
+        value = payload.get("value", "")
+        if not key:
+            logger.warning("update_env: missing key")
+            return
+        self._apply_env_var(key, str(value))
 
     # ── Settings ──────────────────────────────────────────────────
 
-    def _apply_setting(self, key: str, value) -> None:
+    # settings.json keys the dashboard may read and write (folder paths excluded)
+    _SETTING_KEYS = frozenset({
+        "stream_title_template",
+        "ignore_streamer",
+        "notify_video_transitions",
+        "min_playlists_per_rotation",
+        "max_playlists_per_rotation",
+        "download_retry_attempts",
+        "yt_dlp_use_cookies",
+        "yt_dlp_browser_for_cookies",
+        "yt_dlp_verbose",
+    })
+
+    async def _apply_setting(self, key: str, value) -> None:
         """Write a single setting change to settings.json.
 
         Only whitelisted keys are accepted to prevent arbitrary file writes.
-        After writing, the ConfigManager's mtime cache will pick up the
-        change automatically on the next get_settings() call.
+        The file is rewritten in a worker thread so the event loop keeps
+        running.  After writing, the ConfigManager's mtime cache will pick
+        up the change automatically on the next get_settings() call.
         """
-        allowed_keys = {
-            "stream_title_template",
-            "ignore_streamer",
-            "notify_video_transitions",
-            "min_playlists_per_rotation",
-            "max_playlists_per_rotation",
-            "download_retry_attempts",
-            "yt_dlp_use_cookies",
-            "yt_dlp_browser_for_cookies",
-            "yt_dlp_verbose",
-        }
-
-        if key not in allowed_keys:
+        if key not in self._SETTING_KEYS:
             logger.warning(f"Dashboard tried to set disallowed key: {key}")
             return
 
         settings_path = self.ctrl.config_manager.settings_path
         try:
-            with open(settings_path, "r", encoding="utf-8") as f:
-                data = json.load(f)
-            data[key] = value
-            with open(settings_path, "w", encoding="utf-8") as f:
-                json.dump(data, f, indent=2, ensure_ascii=False)
+            await asyncio.to_thread(self._write_setting, settings_path, key, value)
             logger.info(f"Setting '{key}' updated to {value!r} via dashboard")
         except Exception as e:
             logger.error(f"Failed to update setting '{key}': {e}")
 
+    @staticmethod
+    def _write_setting(settings_path: str, key: str, value) -> None:
+        """Read-modify-write one key of settings.json, replacing the file atomically.
+
+        The new contents go to a temp file that is swapped in with
+        ``os.replace``, so readers never see a half-written file.
+        """
+        with open(settings_path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+        data[key] = value
+        tmp_path = f"{settings_path}.tmp"
+        try:
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(data, f, indent=2, ensure_ascii=False)
+            os.replace(tmp_path, settings_path)
+        except BaseException:
+            try:
+                os.remove(tmp_path)
+            except OSError:
+                pass
+            raise
+
     # ── Environment variables ─────────────────────────────────────
 
     # Keys the owner may read and/or write from the dashboard.
     # "safe" keys have their value sent to the frontend;
     # "secret" keys only report whether they are set (write-only).
-    _ENV_SAFE_KEYS = {
+    _ENV_SAFE_KEYS = frozenset({
         "OBS_HOST", "OBS_PORT",
         "SCENE_PAUSE", "SCENE_STREAM", "SCENE_ROTATION_SCREEN",
         "VLC_SOURCE_NAME",
         "ENABLE_TWITCH", "ENABLE_KICK",
         "TARGET_TWITCH_STREAMER", "TARGET_KICK_STREAMER",
-    }
-    _ENV_SECRET_KEYS = {
+    })
+    _ENV_SECRET_KEYS = frozenset({
         "OBS_PASSWORD",
         "TWITCH_CLIENT_ID", "TWITCH_CLIENT_SECRET",
         "KICK_CLIENT_ID", "KICK_CLIENT_SECRET",
         "DISCORD_WEBHOOK_URL",
-    }
+    })
     _ENV_ALLOWED_KEYS = _ENV_SAFE_KEYS | _ENV_SECRET_KEYS
 
     def _build_env_config(self) -> dict:
@@ -492,14 +585,25 @@ class DashboardHandler:
 
         Safe keys include their current value.  Secret keys only report
         ``True``/``False`` to indicate whether they are configured (the
-        actual secret is never sent over the wire).
+        actual secret is never sent over the wire).  The result is kept
+        until :meth:`_reload_env` re-reads the .env file.
         """
-        config: dict[str, dict] = {}
-        for key in self._ENV_SAFE_KEYS:
-            config[key] = {"value": os.getenv(key, ""), "secret": False}
-        for key in self._ENV_SECRET_KEYS:
-            config[key] = {"value": bool(os.getenv(key, "")), "secret": True}
-        return config
+        if self._env_config is None:
+            env = os.environ
+            config: dict[str, dict] = {}
+            for key in self._ENV_SAFE_KEYS:
+                config[key] = {"value": env.get(key, ""), "secret": False}
+            for key in self._ENV_SECRET_KEYS:
+                config[key] = {"value": bool(env.get(key, "")), "secret": True}
+            self._env_config = config
+        return self._env_config
+
+    def _reload_env(self) -> dict:
+        """Reload .env through the controller and drop the cached env config."""
+        try:
+            return self.ctrl.reload_env()
+        finally:
+            self._env_config = None
 
     def _apply_env_var(self, key: str, value: str) -> None:
         """Write a single env var to the .env file, then trigger reload.
@@ -510,12 +614,16 @@ class DashboardHandler:
             logger.warning(f"Dashboard tried to set disallowed env key: {key}")
             return
 
-        from config.constants import _PROJECT_ROOT
         env_path = os.path.join(_PROJECT_ROOT, '.env')
         if not os.path.isfile(env_path):
             logger.error("update_env: .env file not found")
             return
 
+        # Unchanged in both .env and the running process: skip the rewrite and reload
+        if os.getenv(key, "") == value and dotenv_values(env_path).get(key) == value:
+            logger.debug("Env var '%s' unchanged — skipping write", key)
+            return
+
         try:
             set_key(env_path, key, value)
             is_secret = key in self._ENV_SECRET_KEYS
@@ -526,7 +634,7 @@ class DashboardHandler:
             return
 
         # Apply immediately
-        self.ctrl.reload_env()
+        self._reload_env()
 
     # ── Manual pause / resume ─────────────────────────────────────
 
@@ -683,7 +791,6 @@ class DashboardHandler:
             if ctrl.playback_monitor:
                 category = ctrl.playback_monitor.get_category_for_current_video()
             if not category and playlist_names:
-                from utils.video_utils import resolve_playlist_categories
                 for p in ctrl.config_manager.get_playlists():
                     if p.get('name') == playlist_names[0]:
                         category = resolve_playlist_categories(p)
@@ -774,11 +881,14 @@ class DashboardHandler:
     # ── Playlist CRUD from dashboard ──────────────────────────────
 
     def _load_playlists_raw(self) -> dict:
-        """Load the raw playlists.json file."""
+        """Load the raw playlists.json file and index its playlist names."""
         try:
-            with open(self.ctrl.config_manager.config_path, "r", encoding="utf-8") as f:
-                return json.load(f)
+            with open(self.ctrl.config_manager.config_path, "rb") as f:
+                data = json_utils.loads(f.read())
+            self._name_idx = self._index_playlist_names(data.get("playlists", []))
+            return data
         except Exception as e:
+            self._name_idx = {}
             logger.error(f"Failed to load playlists.json: {e}")
             return {"playlists": []}
 
@@ -786,13 +896,21 @@ class DashboardHandler:
         """Write the playlists.json file. Returns True on success."""
         try:
             with open(self.ctrl.config_manager.config_path, "w", encoding="utf-8") as f:
-                json.dump(data, f, indent=2, ensure_ascii=False)
+                f.write(json_utils.dumps_pretty(data))
             logger.info("playlists.json updated via dashboard")
             return True
         except Exception as e:
             logger.error(f"Failed to save playlists.json: {e}")
             return False
 
+    @staticmethod
+    def _index_playlist_names(playlists: list) -> dict[str, int]:
+        """Map each lowercased playlist name to its first position in *playlists*."""
+        index: dict[str, int] = {}
+        for i, p in enumerate(playlists):
+            index.setdefault(p.get("name", "").lower(), i)
+        return index
+
     def _playlist_add(self, payload: dict) -> None:
         """Add a new playlist from dashboard payload."""
         name = payload.get("name", "").strip()
@@ -803,12 +921,13 @@ class DashboardHandler:
 
         data = self._load_playlists_raw()
         # Prevent duplicates by name
-        for p in data.get("playlists", []):
-            if p.get("name", "").lower() == name.lower():
-                logger.warning(f"Playlist '{name}' already exists — skipping add")
-                return
+        if name.lower() in self._name_idx:
+            logger.warning(f"Playlist '{name}' already exists — skipping add")
+            return
 
-        data.setdefault("playlists", []).append({
+        playlists = data.setdefault("playlists", [])
+        self._name_idx[name.lower()] = len(playlists)
+        playlists.append({
             "name": name,
             "url": url,
             "twitch_category": payload.get("twitch_category", "Just Chatting"),
@@ -825,36 +944,36 @@ class DashboardHandler:
             return
 
         data = self._load_playlists_raw()
-        for p in data.get("playlists", []):
-            if p.get("name", "").lower() == name.lower():
-                if "url" in payload:
-                    p["url"] = payload["url"]
-                if "twitch_category" in payload:
-                    p["twitch_category"] = payload["twitch_category"]
-                if "kick_category" in payload:
-                    p["kick_category"] = payload["kick_category"]
-                if "enabled" in payload:
-                    p["enabled"] = payload["enabled"]
-                if "priority" in payload:
-                    p["priority"] = payload["priority"]
-                self._save_playlists_raw(data)
-                return
-        logger.warning(f"Playlist '{name}' not found for update")
+        i = self._name_idx.get(name.lower())
+        if i is None:
+            logger.warning(f"Playlist '{name}' not found for update")
+            return
+        p = data["playlists"][i]
+        if "url" in payload:
+            p["url"] = payload["url"]
+        if "twitch_category" in payload:
+            p["twitch_category"] = payload["twitch_category"]
+        if "kick_category" in payload:
+            p["kick_category"] = payload["kick_category"]
+        if "enabled" in payload:
+            p["enabled"] = payload["enabled"]
+        if "priority" in payload:
+            p["priority"] = payload["priority"]
+        self._save_playlists_raw(data)
 
     def _playlist_remove(self, name: str) -> None:
         """Remove a playlist by name."""
         if not name:
             return
         data = self._load_playlists_raw()
-        original_len = len(data.get("playlists", []))
-        data["playlists"] = [
-            p for p in data.get("playlists", [])
-            if p.get("name", "").lower() != name.lower()
-        ]
-        if len(data["playlists"]) < original_len:
-            self._save_playlists_raw(data)
-        else:
+        i = self._name_idx.get(name.lower())
+        if i is None:
             logger.warning(f"Playlist '{name}' not found for removal")
+            return
+        del data["playlists"][i]
+        # Every later entry shifts down one, so re-index rather than patch
+        self._name_idx = self._index_playlist_names(data["playlists"])
+        self._save_playlists_raw(data)
 
     def _playlist_rename(self, old_name: str, new_name: str) -> None:
         """Rename a playlist: update playlists.json and cascade through DB."""
@@ -868,21 +987,17 @@ class DashboardHandler:
 
         data = self._load_playlists_raw()
         # Check for name collision
-        for p in data.get("playlists", []):
-            if p.get("name", "").lower() == new_name.lower():
-                logger.warning(f"Cannot rename to '{new_name}' — name already exists")
-                return
+        if new_name.lower() in self._name_idx:
+            logger.warning(f"Cannot rename to '{new_name}' — name already exists")
+            return
 
         # Update playlists.json
-        found = False
-        for p in data.get("playlists", []):
-            if p.get("name", "").lower() == old_name.lower():
-                p["name"] = new_name
-                found = True
-                break
-        if not found:
+        i = self._name_idx.pop(old_name.lower(), None)
+        if i is None:
             logger.warning(f"Playlist '{old_name}' not found for rename")
             return
+        data["playlists"][i]["name"] = new_name
+        self._name_idx[new_name.lower()] = i
         self._save_playlists_raw(data)
 
         # Cascade through database
@@ -896,9 +1011,10 @@ class DashboardHandler:
         if not name:
             return
         data = self._load_playlists_raw()
-        for p in data.get("playlists", []):
-            if p.get("name", "").lower() == name.lower():
-                p["enabled"] = enabled if enabled is not None else not p.get("enabled", True)
-                self._save_playlists_raw(data)
-                return
-        logger.warning(f"Playlist '{name}' not found for toggle")
+        i = self._name_idx.get(name.lower())
+        if i is None:
+            logger.warning(f"Playlist '{name}' not found for toggle")
+            return
+        p = data["playlists"][i]
+        p["enabled"] = enabled if enabled is not None else not p.get("enabled", True)
+        self._save_playlists_raw(data)
@@ -254,33 +254,27 @@ class DownloadManager:
 
         logger.info(f"Processing {len(pending_videos)} queued videos for database registration")
 
-        registered_count = 0
-        total_duration = 0
-
-        for video_data in pending_videos:
-            try:
-                self.db.add_video(
-                    video_data["playlist_id"],
-                    video_data["filename"],
-                    title=video_data["title"],
-                    duration_seconds=video_data["duration_seconds"],
-                    file_size_mb=video_data["file_size_mb"],
-                    playlist_name=video_data.get("playlist_name"),
-                )
-                registered_count += 1
-                total_duration += video_data["duration_seconds"]
-                logger.debug(
-                    f"Registered queued video: {video_data['filename']} ({video_data['duration_seconds']}s)"
-                )
-            except Exception as e:
-                if "UNIQUE constraint failed" in str(e) or "already exists" in str(e):
-                    logger.debug(f"Video already exists in database: {video_data['filename']}, skipping")
-                else:
+        try:
+            registered = self.db.register_videos_bulk(pending_videos)
+        except Exception as e:
+            # The batch was rolled back; retry row by row so one bad video
+            # doesn't cost the rest of the batch
+            logger.error(f"Error registering {len(pending_videos)} queued videos, retrying individually: {e}")
+            registered = []
+            for video_data in pending_videos:
+                try:
+                    registered.extend(self.db.register_videos_bulk([video_data]))
+                except Exception as e:
                     logger.error(f"Error registering queued video {video_data['filename']}: {e}")
 
-        if registered_count > 0:
+        skipped = len(pending_videos) - len(registered)
+        if skipped:
+            logger.debug(f"{skipped} queued videos already exist in database or failed, skipped")
+
+        if registered:
+            total_duration = sum(v.get("duration_seconds") or 0 for v in registered)
             logger.info(
-                f"Registered {registered_count} queued videos from background download, total: {total_duration}s"
+                f"Registered {len(registered)} queued videos from background download, total: {total_duration}s"
             )
 
     def process_pending_database_operations(self) -> None:
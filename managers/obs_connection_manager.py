@@ -90,17 +90,17 @@ class OBSConnectionManager:
 
             def on_media_input_playback_ended(data):  # type: ignore[no-untyped-def]
                 if data.input_name != self._vlc_source_name:
-                    logger.debug(f"OBS event: MediaInputPlaybackEnded ignored (source: {data.input_name})")
+                    logger.debug("OBS event: MediaInputPlaybackEnded ignored (source: %s)", data.input_name)
                     return
                 self.media_event_queue.put("ended")
-                logger.debug(f"OBS event: MediaInputPlaybackEnded ({data.input_name})")
+                logger.debug("OBS event: MediaInputPlaybackEnded (%s)", data.input_name)
 
             def on_media_input_playback_started(data):  # type: ignore[no-untyped-def]
                 if data.input_name != self._vlc_source_name:
-                    logger.debug(f"OBS event: MediaInputPlaybackStarted ignored (source: {data.input_name})")
+                    logger.debug("OBS event: MediaInputPlaybackStarted ignored (source: %s)", data.input_name)
                     return
                 self.media_event_queue.put("started")
-                logger.debug(f"OBS event: MediaInputPlaybackStarted ({data.input_name})")
+                logger.debug("OBS event: MediaInputPlaybackStarted (%s)", data.input_name)
 
             self._event_client.callback.register([
                 on_media_input_playback_ended,
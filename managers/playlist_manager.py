@@ -35,24 +35,19 @@ class PlaylistManager:
         Note: This retrieves the config metadata (including category) for playlists
         by looking up their names from the database.
         """
-        config_playlists = self.config.get_playlists()
-        
-        # Get playlist names from database by their IDs
+        # Get playlist names from database by their IDs (one query)
         db_playlists = {}
-        for pid in playlist_ids:
-            playlist = self.db.get_playlist(pid)
-            if playlist:
-                db_playlists[playlist.get('name')] = pid
+        for playlist in self.db.get_playlists_by_ids(playlist_ids):
+            db_playlists[playlist.get('name')] = playlist['id']
         
         # Find matching playlists in config, enriched with DB id
         result = []
         for name, pid in db_playlists.items():
-            for p in config_playlists:
-                if p.get('name') == name:
-                    enriched = dict(p)
-                    enriched['id'] = pid
-                    result.append(enriched)
-                    break
+            p = self.config.get_playlist_by_name(name)
+            if p is not None:
+                enriched = dict(p)
+                enriched['id'] = pid
+                result.append(enriched)
         
         return result
     
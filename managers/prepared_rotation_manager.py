@@ -82,6 +82,8 @@ class PreparedRotationManager:
         self._executing_folder: Optional[str] = None
 
         os.makedirs(PREPARED_BASE, exist_ok=True)
+        # Resolved once; resolve_folder() checks every slug against it
+        self._prepared_base_real = os.path.realpath(PREPARED_BASE)
 
         # On startup, reset any rotation left in "executing" state from a
         # previous crash / unclean shutdown back to "ready" so the user can
@@ -110,7 +112,7 @@ class PreparedRotationManager:
         folder = os.path.join(PREPARED_BASE, slug)
         # Double-check the resolved path is still under PREPARED_BASE
         resolved = os.path.realpath(folder)
-        if not resolved.startswith(os.path.realpath(PREPARED_BASE)):
+        if not resolved.startswith(self._prepared_base_real):
             logger.warning(f"Slug resolved outside PREPARED_BASE: {slug!r} -> {resolved}")
             return None
         if not os.path.isdir(folder):
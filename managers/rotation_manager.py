@@ -8,7 +8,6 @@ shared state.
 from __future__ import annotations
 
 import asyncio
-import json
 import logging
 from typing import TYPE_CHECKING
 
@@ -17,6 +16,7 @@ if TYPE_CHECKING:
 
 from core.database import DatabaseManager
 from config.constants import DEFAULT_VIDEO_FOLDER, DEFAULT_NEXT_ROTATION_FOLDER
+from utils import json_utils
 
 logger = logging.getLogger(__name__)
 
@@ -165,20 +165,31 @@ class RotationManager:
             # Process any queued videos from downloads so they're in database before rename/category lookup
             ctrl.download_manager.process_video_registration_queue()
 
+            # The session was created before the switch and doesn't change
+            # during it — fetch it once and reuse it for every step below.
+            session = ctrl.db.get_current_session()
+
+            # Resolve the session's selected playlists once as well; the
+            # rename, category fallback and notification all need them.
+            session_playlists = None
+            try:
+                if session:
+                    session_playlists = ctrl.content_switch_handler.get_session_playlists(session)
+            except Exception as e:
+                logger.warning(f"Failed to resolve selected playlists: {e}")
+
             # Rename videos with playlist ordering prefix (01_, 02_, etc.)
             # so alphabetical ordering groups by playlist
             try:
-                session = ctrl.db.get_current_session()
-                if session:
-                    playlists_selected = session.get('playlists_selected', '')
-                    if playlists_selected:
-                        playlist_ids = json.loads(playlists_selected)
-                        playlists = ctrl.playlist_manager.get_playlists_by_ids(playlist_ids)
-                        playlist_order = [p['name'] for p in playlists]
-                        ctrl.playlist_manager.rename_videos_with_playlist_prefix(current_folder, playlist_order)
+                if session_playlists:
+                    playlist_order = [p['name'] for p in session_playlists]
+                    ctrl.playlist_manager.rename_videos_with_playlist_prefix(current_folder, playlist_order)
             except Exception as e:
                 logger.warning(f"Failed to rename videos with prefix: {e}")
 
+            # Map the new rotation's videos to playlists once for category lookups
+            ctrl.content_switch_handler.prime_video_index(current_folder)
+
             # Finalize (update VLC + switch scene)
             target_scene = self._scene_pause if ctrl.last_stream_status == "live" else self._scene_stream
             finalize_success, vlc_playlist = ctrl.content_switch_handler.finalize_switch(
@@ -193,7 +204,6 @@ class RotationManager:
 
             # Update stream title and category based on current video
             try:
-                session = ctrl.db.get_current_session()
                 if session:
                     stream_title = session.get('stream_title', '')
 
@@ -205,7 +215,7 @@ class RotationManager:
                     # Fallback: get category from first playlist
                     if not category and ctrl.content_switch_handler:
                         category = ctrl.content_switch_handler.get_initial_rotation_category(
-                            current_folder, ctrl.playlist_manager
+                            current_folder, session=session, playlists=session_playlists
                         )
 
                     await ctrl.stream_manager.update_stream_info(stream_title, category)
@@ -229,13 +239,8 @@ class RotationManager:
             # check_for_rotation (all_consumed path) — doing it here as
             # well would double-increment play_count.
             try:
-                session = ctrl.db.get_current_session()
-                if session:
-                    playlists_selected = session.get('playlists_selected', '')
-                    if playlists_selected:
-                        pids = json.loads(playlists_selected)
-                        pls = ctrl.playlist_manager.get_playlists_by_ids(pids)
-                        ctrl.notification_service.notify_rotation_switched([p['name'] for p in pls])
+                if session_playlists:
+                    ctrl.notification_service.notify_rotation_switched([p['name'] for p in session_playlists])
             except Exception:
                 pass  # Non-critical
 
@@ -272,8 +277,11 @@ class RotationManager:
                 try:
                     playlists_selected = session.get('playlists_selected', '')
                     if playlists_selected:
-                        playlist_ids = json.loads(playlists_selected)
-                        playlists = ctrl.playlist_manager.get_playlists_by_ids(playlist_ids)
+                        if ctrl.content_switch_handler:
+                            # Usually already resolved (and cached) during the content switch
+                            playlists = ctrl.content_switch_handler.get_session_playlists(session)
+                        else:
+                            playlists = ctrl.playlist_manager.get_playlists_by_ids(json_utils.loads(playlists_selected))
                         if playlists:
                             current_playlist_names = [p['name'] for p in playlists]
                             # Record what was just played
@@ -397,12 +405,8 @@ class RotationManager:
             playlists_json = session.get('playlists_selected')
             if playlists_json:
                 try:
-                    playlist_ids = json.loads(playlists_json)
-                    playlist_names = []
-                    for pid in playlist_ids:
-                        p = ctrl.db.get_playlist(pid)
-                        if p:
-                            playlist_names.append(p['name'])
+                    playlist_ids = json_utils.loads(playlists_json)
+                    playlist_names = [p['name'] for p in ctrl.db.get_playlists_by_ids(playlist_ids)]
                     if playlist_names:
                         preview_names = ctrl._get_next_rotation_preview_names()
                         title = ctrl.playlist_manager.generate_stream_title(
@@ -15,11 +15,12 @@ The monitor still owns:
 * per-video category resolution
 """
 
+import bisect
 import logging
 import os
 import time
 from queue import Queue, Empty
-from typing import Optional, TYPE_CHECKING
+from typing import Callable, Optional, TYPE_CHECKING
 
 from config.constants import VIDEO_EXTENSIONS
 from utils.video_utils import strip_ordering_prefix, resolve_category_for_video
@@ -35,6 +36,11 @@ logger = logging.getLogger(__name__)
 class PlaybackMonitor:
     """Tracks OBS VLC source playback using WebSocket media events."""
 
+    # A folder listing is only cached once the folder's mtime is at least
+    # this old, so changes within the filesystem's timestamp granularity
+    # (up to 2s on FAT/exFAT) are never hidden behind an unchanged mtime.
+    LISTING_CACHE_MIN_AGE_NS = 2_000_000_000
+
     def __init__(
         self,
         db: 'DatabaseManager',
@@ -43,12 +49,16 @@ class PlaybackMonitor:
         event_queue: Queue,
         config: Optional['ConfigManager'] = None,
         scene_stream: str = "OSR Stream",
+        category_resolver: Optional[Callable[[str], Optional[dict[str, str]]]] = None,
     ):
         self.db = db
         self.obs_controller = obs_controller
         self.vlc_source_name = vlc_source_name
         self.config = config
         self.scene_stream = scene_stream
+        # Shared filename -> categories lookup (ContentSwitchHandler's cached
+        # resolver); falls back to a direct DB/config resolve when unset
+        self.category_resolver = category_resolver
 
         # Thread-safe queue fed by OBSConnectionManager EventClient
         self._event_queue: Queue = event_queue
@@ -86,6 +96,9 @@ class PlaybackMonitor:
         # drained (rotation switch, resume, etc.).
         self._ended_suppress: int = 0
 
+        # (folder, mtime_ns, sorted files) for get_video_files_cached()
+        self._video_files_cache: Optional[tuple[str, int, list[str]]] = None
+
     # ------------------------------------------------------------------
     # Initialization
     # ------------------------------------------------------------------
@@ -330,10 +343,7 @@ class PlaybackMonitor:
                 self._current_video = files[0] if files else None
             else:
                 # Prepared-rotation mode — advance by index
-                cur_idx = (
-                    files.index(previous_video)
-                    if previous_video in files else -1
-                )
+                cur_idx = self.index_of_video(files, previous_video)
                 if cur_idx >= 0 and cur_idx + 1 < len(files):
                     self._current_video = files[cur_idx + 1]
                 else:
@@ -481,6 +491,17 @@ class PlaybackMonitor:
     # File helpers
     # ------------------------------------------------------------------
 
+    @staticmethod
+    def index_of_video(files: list[str], filename: Optional[str]) -> int:
+        """Position of *filename* in a list from :meth:`_get_video_files`, or -1.
+
+        The list is sorted, so this is a binary search rather than a scan.
+        """
+        if not filename:
+            return -1
+        i = bisect.bisect_left(files, filename)
+        return i if i < len(files) and files[i] == filename else -1
+
     def _get_video_files(self) -> list[str]:
         """Video files in folder, sorted alphabetically (prefix-ordered)."""
         if not self.video_folder or not os.path.exists(self.video_folder):
@@ -496,6 +517,29 @@ class PlaybackMonitor:
             )
             return []
 
+    def get_video_files_cached(self) -> list[str]:
+        """Like :meth:`_get_video_files`, reusing the last listing while the folder's mtime is unchanged.
+
+        Meant for read-only consumers such as the dashboard; playback
+        itself always lists the folder fresh.
+        """
+        folder = self.video_folder
+        try:
+            mtime_ns = os.stat(folder).st_mtime_ns
+        except (OSError, ValueError):
+            return self._get_video_files()
+
+        cached = self._video_files_cache
+        if cached is not None and cached[0] == folder and cached[1] == mtime_ns:
+            return list(cached[2])
+
+        files = self._get_video_files()
+        if time.time_ns() - mtime_ns >= self.LISTING_CACHE_MIN_AGE_NS:
+            self._video_files_cache = (folder, mtime_ns, files)
+            return list(files)
+        self._video_files_cache = None
+        return files
+
     def _delete_video(self, filepath: str) -> bool:
         """Delete a completed video file."""
         try:
@@ -536,7 +580,7 @@ class PlaybackMonitor:
                 self._vlc_update_suppress = True
                 self._arm_suppress()
                 files = self._get_video_files()
-                logger.debug(f"Updated VLC source: {len(files)} videos remaining")
+                logger.debug("Updated VLC source: %d videos remaining", len(files))
         except Exception as e:
             logger.error(f"Failed to update VLC source after deletion: {e}")
 
@@ -548,6 +592,12 @@ class PlaybackMonitor:
         """Per-platform stream categories for the current video."""
         if not self._current_video or not self.config:
             return None
+        if self.category_resolver is not None:
+            try:
+                return self.category_resolver(self._current_video)
+            except Exception as e:
+                logger.error(f"Failed to resolve category for video {self._current_video}: {e}")
+                return None
         return resolve_category_for_video(
             self._current_video, self.db, self.config
         )
@@ -67,6 +67,9 @@ if exist "core\stream_data.db" (
 ) else (
     echo stream_data.db not found (already deleted)
 )
+REM Remove SQLite WAL side files so a fresh database doesn't pick them up
+if exist "core\stream_data.db-wal" del /f /q "core\stream_data.db-wal"
+if exist "core\stream_data.db-shm" del /f /q "core\stream_data.db-shm"
 
 echo.
 REM Delete live videos
@@ -62,6 +62,8 @@ if [ -f "core/stream_data.db" ]; then
 else
     echo "stream_data.db not found (already deleted)"
 fi
+# Remove SQLite WAL side files so a fresh database doesn't pick them up
+rm -f "core/stream_data.db-wal" "core/stream_data.db-shm"
 
 echo ""
 # Delete live videos
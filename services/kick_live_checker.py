@@ -101,7 +101,7 @@ class KickLiveChecker:
             if channels:
                 stream = channels[0].get("stream") or {}
                 is_live = stream.get("is_live", False)
-                logger.debug(f"Checked Kick {channel_slug} live status: {is_live}")
+                logger.debug("Checked Kick %s live status: %s", channel_slug, is_live)
                 return is_live
             logger.debug(f"Kick channel '{channel_slug}' not found in API response")
             return False
@@ -129,7 +129,7 @@ class TwitchLiveChecker:
             response.raise_for_status()
             data = response.json()
             is_live = bool(data.get("data"))
-            logger.debug(f"Checked {username} live status: {is_live}")
+            logger.debug("Checked %s live status: %s", username, is_live)
             return is_live
         except requests.RequestException as e:
             logger.error(f"Failed to check stream status for {username}: {e}")
@@ -7,15 +7,18 @@ Connects to the web backend via WebSocket and:
 """
 
 import asyncio
+import inspect
 import json
 import logging
 import time
 from datetime import datetime, timezone
-from typing import Optional, Callable, Awaitable, Any
+from typing import Optional, Callable, Awaitable, Any, Union
 
 import websockets
 from websockets.asyncio.client import ClientConnection
 
+from utils import json_utils
+
 logger = logging.getLogger(__name__)
 
 # Suppress noisy websockets library logging
@@ -84,14 +87,15 @@ class WebDashboardClient:
     def __init__(
         self,
         api_key: str,
-        state_provider: Callable[[], dict],
+        state_provider: Callable[[], Union[dict, Awaitable[dict]]],
         command_handler: Callable[[dict], Awaitable[None]],
         server_url: str = "ws://localhost:8000",
     ):
         """
         Args:
             api_key: The OSR instance API key (from the web dashboard team page).
-            state_provider: A callable returning the current state dict to push.
+            state_provider: A callable returning the current state dict to push
+                (or an awaitable resolving to it).
             command_handler: An async callable handling incoming commands from the dashboard.
             server_url: WebSocket server base URL (ws:// or wss://).
         """
@@ -182,13 +186,20 @@ class WebDashboardClient:
         self.detach_logger()
         logger.info("Dashboard client stopped")
 
+    async def _get_state(self) -> dict:
+        """Call the state provider, awaiting it if it is async."""
+        state = self._state_provider()
+        if inspect.isawaitable(state):
+            state = await state
+        return state
+
     async def push_state_now(self) -> None:
         """Immediately push a state snapshot (call after commands that change state)."""
         if not self._connected or not self._ws:
             return
         try:
-            state = self._state_provider()
-            await self._ws.send(json.dumps({"type": "state", "data": state}))
+            state = await self._get_state()
+            await self._ws.send(json_utils.dumps({"type": "state", "data": state}))
             logger.debug("Immediate state push sent")
         except Exception as e:
             logger.debug(f"Failed to send immediate state push: {e}")
@@ -206,7 +217,7 @@ class WebDashboardClient:
             payload: dict = {"type": "event", "event": event_type}
             if data:
                 payload["data"] = data
-            await self._ws.send(json.dumps(payload))
+            await self._ws.send(json_utils.dumps(payload))
         except Exception as e:
             logger.debug(f"Failed to send event '{event_type}': {e}")
 
@@ -220,8 +231,8 @@ class WebDashboardClient:
             # Push state snapshot
             if now - last_state_push >= _STATE_PUSH_INTERVAL:
                 try:
-                    state = self._state_provider()
-                    await ws.send(json.dumps({"type": "state", "data": state}))
+                    state = await self._get_state()
+                    await ws.send(json_utils.dumps({"type": "state", "data": state}))
                     last_state_push = now
                 except Exception as e:
                     logger.debug(f"Failed to send state: {e}")
@@ -231,7 +242,7 @@ class WebDashboardClient:
             entries = await self._log_handler.drain()
             for entry in entries:
                 try:
-                    await ws.send(json.dumps({"type": "log", "data": entry}))
+                    await ws.send(json_utils.dumps({"type": "log", "data": entry}))
                 except Exception:
                     return
 
@@ -0,0 +1,44 @@
+"""Regression tests for stream title truncation."""
+import pytest
+
+from handlers.content_switch_handler import _truncate_title
+
+
+def _split_truncate(title: str, limit: int) -> str:
+    """Reference: the original split-and-rejoin truncation."""
+    if len(title) <= limit:
+        return title
+    parts = title.split(' | ')
+    if len(parts) < 2:
+        return title[:limit]
+    result = parts[0]
+    for playlist in parts[1:]:
+        candidate = f"{result} | {playlist}"
+        if len(candidate) > limit:
+            break
+        result = candidate
+    return result
+
+
+@pytest.mark.parametrize("title, limit, expected", [
+    ("Live | Alpha | Beta | Gamma", 20, "Live | Alpha | Beta"),
+    ("Live | Alpha | Beta", 3, "Live"),
+    ("NoSeparatorHere", 5, "NoSep"),
+    # Names starting or ending with "|" next to a separator
+    ("Live | |Pipe | Next", 14, "Live | |Pipe"),
+    ("Live | Pipe| | Next", 13, "Live | Pipe|"),
+    ("Live | | | | Next", 12, "Live | |"),
+])
+def test_truncate_title_matches_split(title, limit, expected):
+    assert _truncate_title(title, limit) == _split_truncate(title, limit)
+    assert _truncate_title(title, limit) == expected
+
+
+def test_truncate_title_pipe_edged_names_exhaustive():
+    names = ["", "|", "||", "a", "|a", "a|", "| a", "a |"]
+    for template in ("T", "T |", "| T"):
+        for first in names:
+            for second in names:
+                title = f"{template} | {first} | {second} | tail"
+                for limit in range(len(title)):
+                    assert _truncate_title(title, limit) == _split_truncate(title, limit), (title, limit)
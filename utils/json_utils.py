@@ -0,0 +1,44 @@
+"""
+JSON encode/decode helpers with an optional orjson backend.
+
+orjson is used when installed (it is considerably faster for the small
+JSON blobs stored in the database); otherwise the standard library is
+used.  Both paths take and return ``str`` so callers don't need to care
+which backend is active.
+"""
+
+import json
+from typing import Any
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+def dumps(obj: Any) -> str:
+    """Serialize *obj* to a compact JSON string."""
+    if orjson is not None:
+        return orjson.dumps(obj).decode()
+    return json.dumps(obj, separators=(',', ':'))
+
+
+def dumps_pretty(obj: Any) -> str:
+    """Serialize *obj* with 2-space indentation for hand-editable files.
+
+    Non-ASCII characters are written as-is rather than escaped.
+    """
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2).decode()
+    return json.dumps(obj, indent=2, ensure_ascii=False)
+
+
+def loads(value: Any) -> Any:
+    """Parse a JSON ``str``/``bytes`` value.
+
+    Raises ``ValueError`` (``json.JSONDecodeError`` and
+    ``orjson.JSONDecodeError`` both subclass it) on malformed input.
+    """
+    if orjson is not None:
+        return orjson.loads(value)
+    return json.loads(value)
@@ -9,6 +9,7 @@ from datetime import datetime, timezone
 from typing import List, Dict, Optional
 from core.database import DatabaseManager
 from config.config_manager import ConfigManager
+from utils import json_utils
 
 from config.constants import DEFAULT_MIN_PLAYLISTS, DEFAULT_MAX_PLAYLISTS
 
@@ -72,7 +73,7 @@ class PlaylistSelector:
             playlists_selected_json = session.get('playlists_selected')
             if playlists_selected_json:
                 try:
-                    playlists_selected_ids = json.loads(playlists_selected_json) if isinstance(playlists_selected_json, str) else playlists_selected_json
+                    playlists_selected_ids = json_utils.loads(playlists_selected_json) if isinstance(playlists_selected_json, str) else playlists_selected_json
                     for playlist_id in playlists_selected_ids:
                         playlist = self.db.get_playlist(playlist_id)
                         if playlist:
@@ -167,7 +167,7 @@ class VideoDownloader:
                             )
                             with self._registered_files_lock:
                                 self._registered_files.add(filename)
-                            logger.debug(f"Per-video registration queued: {filename} ({duration}s) for {playlist_name}")
+                            logger.debug("Per-video registration queued: %s (%ss) for %s", filename, duration, playlist_name)
                     except Exception as e:
                         logger.debug(f"Per-video registration failed for {filename}: {e}")
 
@@ -291,7 +291,7 @@ class VideoDownloader:
             # cross-playlist registration when multiple playlists share a folder)
             with self._registered_files_lock:
                 if filename in self._registered_files:
-                    logger.debug(f"Already registered via post_hook, skipping batch: {filename}")
+                    logger.debug("Already registered via post_hook, skipping batch: %s", filename)
                     continue
 
             # Also check the database — after a restart _registered_files is empty,
@@ -299,7 +299,7 @@ class VideoDownloader:
             # Without this check, batch registration would assign them to the wrong playlist.
             existing = self.db.get_video_by_filename(filename)
             if existing:
-                logger.debug(f"Already in database (playlist={existing.get('playlist_name')}), skipping batch: {filename}")
+                logger.debug("Already in database (playlist=%s), skipping batch: %s", existing.get('playlist_name'), filename)
                 continue
 
             # Validate video stream before processing (ensures file is complete, not still post-processing)
@@ -335,7 +335,7 @@ class VideoDownloader:
                         self._registered_files.add(filename)
                     total_duration += duration
                     registered_count += 1
-                    logger.debug(f"Queued video for registration: {filename} ({duration}s)")
+                    logger.debug("Queued video for registration: %s (%ss)", filename, duration)
                 except Exception as e:
                     logger.error(f"Error queueing video {filename}: {e}")
             else:
@@ -351,7 +351,7 @@ class VideoDownloader:
                     )
                     total_duration += duration
                     registered_count += 1
-                    logger.debug(f"Registered video: {filename} ({duration}s)")
+                    logger.debug("Registered video: %s (%ss)", filename, duration)
                 except Exception as e:
                     # Check if it's a duplicate constraint error
                     if "UNIQUE constraint failed" in str(e) or "already exists" in str(e):
@@ -55,7 +55,7 @@ class VideoProcessor:
                 data = json.loads(stdout)
                 duration_str = data.get('format', {}).get('duration', '0')
                 duration = int(float(duration_str))
-                logger.debug(f"Got duration for {os.path.basename(file_path)}: {duration}s")
+                logger.debug("Got duration for %s: %ss", os.path.basename(file_path), duration)
                 return duration
             else:
                 logger.warning(f"ffprobe returned {result_returncode} for {os.path.basename(file_path)}")
@@ -118,7 +118,7 @@ class VideoProcessor:
                 )
                 
                 if has_video:
-                    logger.debug(f"Video stream validation passed: {os.path.basename(file_path)}")
+                    logger.debug("Video stream validation passed: %s", os.path.basename(file_path))
                     return True
                 else:
                     logger.warning(f"Video stream validation failed (no video codec found): {os.path.basename(file_path)}")
@@ -158,7 +158,7 @@ class VideoProcessor:
         # Clean up multiple spaces
         title = re.sub(r'\s+', ' ', title).strip()
         
-        logger.debug(f"Extracted title from '{filename}': '{title}'")
+        logger.debug("Extracted title from '%s': '%s'", filename, title)
         return title
 
     @staticmethod
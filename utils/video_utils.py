@@ -66,6 +66,27 @@ def get_video_files_sorted(folder: str) -> list[str]:
     ])
 
 
+def get_first_video_sorted(folder: str) -> Optional[str]:
+    """Get the first video file in a folder in sorted order.
+
+    Same result as ``get_video_files_sorted(folder)[0]`` but a single
+    scandir pass with ``min()`` — no list is built or sorted.
+
+    Args:
+        folder: Path to the folder to scan
+
+    Returns:
+        Alphabetically first video filename, or None if there are none
+    """
+    if not folder or not os.path.isdir(folder):
+        return None
+    with os.scandir(folder) as entries:
+        return min(
+            (e.name for e in entries if e.is_file() and is_video_file(e.name)),
+            default=None
+        )
+
+
 def resolve_playlist_categories(playlist: dict) -> dict[str, str]:
     """Resolve per-platform categories from a playlist config dict.
 
@@ -123,21 +144,20 @@ def resolve_category_for_video(
         # Look up the video in database to find its source playlist
         video = db.get_video_by_filename(clean_filename)
         if not video:
-            logger.debug(f"Video not found in database: {clean_filename}")
+            logger.debug("Video not found in database: %s", clean_filename)
             return None
 
         playlist_name = video.get('playlist_name')
         if not playlist_name:
-            logger.debug(f"No playlist_name for video: {video_filename}")
+            logger.debug("No playlist_name for video: %s", video_filename)
             return None
 
         # Get the category for this playlist from playlists config
-        playlists_config = config.get_playlists()
-        for p in playlists_config:
-            if p.get('name') == playlist_name:
-                return resolve_playlist_categories(p)
+        target_playlist = config.get_playlist_by_name(playlist_name)
+        if target_playlist is not None:
+            return resolve_playlist_categories(target_playlist)
 
-        logger.debug(f"Playlist '{playlist_name}' no longer in config (may have been removed) — skipping category update for: {video_filename}")
+        logger.debug("Playlist '%s' no longer in config (may have been removed) — skipping category update for: %s", playlist_name, video_filename)
         return None
     except Exception as e:
         logger.error(f"Error getting category for video {video_filename}: {e}")